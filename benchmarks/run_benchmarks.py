@@ -0,0 +1,154 @@
+# -----------------------------------------------------------------------------
+# File Name: run_benchmarks.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Times every stage of the detector pipeline and the end-to-end
+#              scan on synthetic RTL and reports the throughput as JSON
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))  # The repository root, for main and rules
+sys.path.insert(0, BENCH_DIR)
+
+from main import find_rtl_files, scan
+from rules import DETECTORS
+from rules.parse_context import ParseContext
+from rules.signal_table import get_signal_table
+from synthetic_rtl import DEFAULT_SCALE, generate_tree
+
+
+def throughput(seconds, files, total_bytes):
+    return {
+        "seconds": round(seconds, 6),
+        "files_per_s": round(files / seconds, 2) if seconds > 0 else None,
+        "mb_per_s": round(total_bytes / seconds / 1e6, 3) if seconds > 0 else None,
+    }
+
+
+def time_stages(rtl_files):
+    """
+    One pass over the files, timing each stage separately: reading the file,
+    building the signal table, and every detector on the shared table.
+    """
+    stages = {"parse_context": 0.0, "signal_table": 0.0}
+    stages.update((detector.__name__, 0.0) for detector in DETECTORS.values())
+    for file_path, file_name in rtl_files:
+        start = time.perf_counter()
+        ctx = ParseContext(file_path, file_name)
+        stages["parse_context"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        get_signal_table(ctx)
+        stages["signal_table"] += time.perf_counter() - start
+
+        for detector in DETECTORS.values():
+            start = time.perf_counter()
+            detector(file_path, file_name, ctx)
+            stages[detector.__name__] += time.perf_counter() - start
+        ctx.close()
+    return stages
+
+
+def run(directory, total_bytes, repeat=3, jobs=1):
+    rtl_files = find_rtl_files(directory)
+    files = len(rtl_files)
+
+    # Best of `repeat` runs, to keep noise out of regression tracking
+    best = None
+    for _ in range(repeat):
+        stages = time_stages(rtl_files)
+        best = stages if best is None else {name: min(best[name], stages[name]) for name in best}
+
+    scan_best = None
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(scan(directory, jobs))
+        elapsed = time.perf_counter() - start
+        scan_best = elapsed if scan_best is None else min(scan_best, elapsed)
+
+    results = {name: throughput(seconds, files, total_bytes) for name, seconds in best.items()}
+    results["scan"] = throughput(scan_best, files, total_bytes)
+    results["scan"]["jobs"] = jobs
+    results["scan"]["rows"] = rows
+    return results
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the asset detectors on synthetic RTL")
+    parser.add_argument("--files", type=int, default=DEFAULT_SCALE["files"], help="number of generated files")
+    parser.add_argument("--ports", type=int, default=DEFAULT_SCALE["ports"], help="ports per module")
+    parser.add_argument("--nets", type=int, default=DEFAULT_SCALE["nets"], help="internal nets per module")
+    parser.add_argument("--params", type=int, default=DEFAULT_SCALE["params"], help="parameters per module")
+    parser.add_argument("--always-blocks", type=int, default=DEFAULT_SCALE["always_blocks"], help="always blocks per module")
+    parser.add_argument("--case-statements", type=int, default=DEFAULT_SCALE["case_statements"], help="case statements per module")
+    parser.add_argument("--sv", action="store_true", help="generate SystemVerilog (.sv, logic) instead of Verilog")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the generator")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the best is reported")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes for the end-to-end scan")
+    parser.add_argument("--rtl-dir", help="benchmark an existing RTL tree instead of generating one")
+    parser.add_argument("--keep", help="generate into this directory and keep it")
+    parser.add_argument("-o", "--out", help="write the JSON report to this file instead of stdout")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scale = {
+        "files": args.files,
+        "ports": args.ports,
+        "nets": args.nets,
+        "params": args.params,
+        "always_blocks": args.always_blocks,
+        "case_statements": args.case_statements,
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.rtl_dir:
+            directory = args.rtl_dir
+            total_bytes = sum(os.path.getsize(path) for path, _ in find_rtl_files(directory))
+            scale = None
+        else:
+            directory = args.keep or temp_dir
+            total_bytes = generate_tree(directory, scale, args.seed, args.sv)
+        files = len(find_rtl_files(directory))
+        results = run(directory, total_bytes, args.repeat, args.jobs)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            "directory": args.rtl_dir,
+            "scale": scale,
+            "systemverilog": args.sv,
+            "seed": args.seed,
+            "files": files,
+            "bytes": total_bytes,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# -----------------------------------------------------------------------------
+# File Name: synthetic_rtl.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Generates synthetic Verilog/SystemVerilog files at a configurable
+#              scale, with the constructs every detector looks for
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import os
+import random
+
+
+DEFAULT_SCALE = {
+    "files": 50,
+    "ports": 40,
+    "nets": 200,
+    "params": 8,
+    "always_blocks": 10,
+    "case_statements": 4,
+}
+
+
+def generate_module(name, scale, rng, systemverilog=False):
+    """
+    One module with `scale` ports, nets, parameters, always blocks and case
+    statements. Port widths are mixed so that control (1 bit), config
+    (2-9 bits), data (8+ bits) and status signals are all present.
+    """
+    net = "logic" if systemverilog else "reg"
+    ports = scale["ports"]
+    nets = scale["nets"]
+    lines = []
+
+    params = []
+    for i in range(scale["params"]):
+        if i % 4 == 0:
+            params.append(f"parameter bit P_EN{i} = 1")
+        else:
+            params.append(f"parameter P_W{i} = {rng.choice((4, 8, 16, 32))}")
+    header = f"module {name}"
+    if params:
+        header += " #(\n    " + ",\n    ".join(params) + "\n)"
+    lines.append(header + " (")
+
+    # ANSI port list: clock/reset, control, config, data in and out, status
+    port_lines = ["    input clk", "    input rst_n"]
+    inputs_1 = []
+    inputs_cfg = []
+    inputs_data = []
+    outputs = []
+    for i in range(ports):
+        kind = i % 4
+        if kind == 0:
+            inputs_1.append(f"en_{i}")
+            port_lines.append(f"    input en_{i}")
+        elif kind == 1:
+            width = rng.randint(2, 9)
+            inputs_cfg.append(f"mode_{i}")
+            port_lines.append(f"    input [{width - 1}:0] mode_{i}")
+        elif kind == 2:
+            width = rng.choice((8, 16, 32, 64, 128))
+            inputs_data.append(f"din_{i}")
+            port_lines.append(f"    input [{width - 1}:0] din_{i}")
+        else:
+            outputs.append(f"done_{i}")
+            port_lines.append(f"    output {net} done_{i}")
+    port_lines.append(f"    output {net} [31:0] dout")
+    lines.append(",\n".join(port_lines))
+    lines.append(");")
+    lines.append("")
+
+    # Internal nets, some of them copies of inputs so control reaches if() through an assignment
+    for i in range(nets):
+        width = rng.choice((1, 1, 4, 8, 32))
+        if width == 1:
+            lines.append(f"    {net} n_{i};")
+        else:
+            lines.append(f"    {net} [{width - 1}:0] n_{i};")
+    lines.append("")
+    for i in range(min(nets, len(inputs_1))):
+        lines.append(f"    assign n_{i} = {inputs_1[i]};")
+    lines.append("")
+
+    # Always blocks with if/else on control inputs and nets
+    for b in range(scale["always_blocks"]):
+        lines.append("    always @(posedge clk or negedge rst_n) begin")
+        lines.append("        if (!rst_n) begin")
+        if outputs:
+            lines.append(f"            {outputs[b % len(outputs)]} <= 1'b0;")
+        lines.append("        end")
+        if inputs_1:
+            cond = inputs_1[b % len(inputs_1)]
+            lines.append(f"        else if ({cond}) begin")
+        else:
+            lines.append("        else begin")
+        for j in range(4):
+            target = f"n_{(b * 4 + j) % nets}" if nets else "dout"
+            source = inputs_data[(b + j) % len(inputs_data)] if inputs_data else "1'b1"
+            lines.append(f"            {target} <= {source};")
+        if inputs_cfg and nets:
+            lines.append(f"            if ({inputs_cfg[b % len(inputs_cfg)]} == 1) n_{b % nets} <= 1'b1;")
+        if outputs:
+            lines.append(f"            {outputs[b % len(outputs)]} <= n_{b % nets};" if nets else
+                         f"            {outputs[b % len(outputs)]} <= 1'b1;")
+        lines.append("        end")
+        lines.append("    end")
+        lines.append("")
+
+    # Case statements on config inputs
+    for c in range(scale["case_statements"]):
+        select = inputs_cfg[c % len(inputs_cfg)] if inputs_cfg else "dout[3:0]"
+        lines.append("    always @(*) begin")
+        lines.append(f"        case ({select})")
+        for value in range(4):
+            source = inputs_data[(c + value) % len(inputs_data)] if inputs_data else "32'h0"
+            lines.append(f"            {value}: dout = {source};")
+        lines.append("            default: dout = 32'h0;")
+        lines.append("        endcase")
+        lines.append("    end")
+        lines.append("")
+
+    lines.append("endmodule")
+    return "\n".join(lines) + "\n"
+
+
+def generate_tree(directory, scale=None, seed=0, systemverilog=False):
+    """
+    Writes scale["files"] modules under `directory`, ten per sub-directory,
+    and returns the total number of bytes written.
+    """
+    scale = dict(DEFAULT_SCALE, **(scale or {}))
+    rng = random.Random(seed)
+    extension = ".sv" if systemverilog else ".v"
+    total_bytes = 0
+    for i in range(scale["files"]):
+        sub_dir = os.path.join(directory, f"block_{i // 10:04d}")
+        os.makedirs(sub_dir, exist_ok=True)
+        code = generate_module(f"synth_{i:05d}", scale, rng, systemverilog)
+        with open(os.path.join(sub_dir, f"synth_{i:05d}{extension}"), 'w') as f:
+            f.write(code)
+        total_bytes += len(code.encode())
+    return total_bytes
@@ -13,78 +13,747 @@
 
 import os
 import re
+import sys
 import csv
+import json
+import shutil
+import argparse
+import time
+import tempfile
+from itertools import chain
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from rules.control_sig import *
-from rules.status_sig import *
-from rules.configuration_sig import *
-from rules.data_sig import *
-from rules.para_sig import *
+from rules.parse_context import ParseContext
+from rules.package_index import PackageIndex, PackageUses, package_summary
+from rules.signal_table import get_signal_table
+from rules.profiling import span
+from rules import profiling
+from rules.result_cache import ResultCache, file_key, clear_cache, default_cache_dir, MODULES, PACKAGES, USES
+from rules.hierarchy import ModuleIndex, module_summaries, classify, propagate_assets
+from rules.rule_registry import default_rules, evaluate_rules, load_rules, rules_fingerprint
+from rules.preprocessor import shared_preprocessor, parse_define
+from rules.file_watch import FileStates
 
 
-asset_dataset = []
+def detect_file(file_path, file_name, hierarchy=False, rules=None, preprocessor=None, packages=None):
+    # rules: the classification rules to apply (default: the built-in ones)
+    # preprocessor: include dirs and defines (default: rules.preprocessor.shared_preprocessor())
+    # packages: PackageIndex of the tree (default: only the packages and typedefs of the file)
+    if rules is None:
+        rules = default_rules()
+    with span(file_name, "file", path=file_path) as file_event:
+        with span("ParseContext", "read", file=file_name) as event:
+            ctx = ParseContext(file_path, file_name, preprocessor, packages) #Read and normalize the file once for all detectors
+            event["bytes"] = file_event["bytes"] = ctx.size
+        try:
+            with span("build_signal_table", "table", file=file_name):
+                table = get_signal_table(ctx)
+        finally:
+            ctx.close()  # The rules and module summaries only need the signal table and AST
+        
+        # Every rule in one pass over the signal table
+        with span("evaluate_rules", "detector", file=file_name, rules=len(rules)) as event:
+            asset_in_file = evaluate_rules(table, file_name, rules)
+            event["matches"] = len(asset_in_file)
+        
+        if hierarchy:
+            with span("module_summaries", "hierarchy", file=file_name):
+                return asset_in_file, module_summaries(ctx)
+    
+    return asset_in_file
 
 
-path = input(r"Enter the IP/File Directory Here: ")
+def detect_file_uses(file_path, file_name, hierarchy=False, rules=None, preprocessor=None, packages=None):
+    # detect_file() and the package values and types the file looked up (PackageUses.record())
+    uses = PackageUses(packages)
+    return detect_file(file_path, file_name, hierarchy, rules, preprocessor, uses), uses.record()
 
 
-def asset_detector_individual_file(directory):
-    total_asset_in_path = []
-    for root, _, files in os.walk(directory):
+CACHE_BLOCK = 512  # Files looked up in the result cache at a time
+
+
+def cache_key(file_path, file_name, preprocessor, rule_set=""):
+    # Result cache key of a file; its content, includes and package markers all come from one read
+    path = os.path.abspath(file_path)
+    return file_key(file_name, preprocessor.content_digest(path), rule_set, preprocessor.dependency_key(path))
+
+
+def package_chunk(rtl_files, preprocessor=None, check=False):
+    # Worker side of the package pre-pass: one JSON-ready summary per file. With check, a file
+    # that has no package marker (Preprocessor.declares_packages) gives None without being parsed
+    if preprocessor is None:
+        preprocessor = shared_preprocessor()
+    summaries = []
+    for file_path, file_name in rtl_files:
+        if check and not preprocessor.declares_packages(os.path.abspath(file_path)):
+            summaries.append(None)
+            continue
+        ctx = ParseContext(file_path, file_name, preprocessor)
+        try:
+            summaries.append(package_summary(ctx))
+        finally:
+            ctx.close()
+    return summaries
+
+
+def package_summaries(rtl_files, preprocessor, executor=None, jobs=1, cache=None):
+    """
+    (file path, package summary) of the files that declare a package or
+    typedef, in file order; other files are never parsed. With a cache,
+    every file is read here once for its key anyway, and that read also
+    finds the files with a package marker; only their summaries that are
+    not cached are computed. Without a cache the markers are checked on
+    the executor, so no file is read here.
+    """
+    check = cache is None
+    if check:
+        candidates = rtl_files
+    else:
+        candidates = [(file_path, file_name) for file_path, file_name in rtl_files
+                      if preprocessor.declares_packages(os.path.abspath(file_path))]
+    keys = []
+    summaries = {}
+    if cache is not None:
+        keys = [cache_key(file_path, file_name, preprocessor) for file_path, file_name in candidates]
+        found = cache.get_many(keys, PACKAGES)
+        summaries = {i: found[key] for i, key in enumerate(keys) if key in found}
+    
+    missing = [i for i in range(len(candidates)) if i not in summaries]
+    if executor is None:
+        fresh = package_chunk([candidates[i] for i in missing], preprocessor, check)
+    else:
+        chunksize = max(1, min(16, len(missing) // (jobs * 4)))
+        futures = [executor.submit(package_chunk, [candidates[i] for i in missing[k:k + chunksize]], preprocessor,
+                                   check)
+                   for k in range(0, len(missing), chunksize)]
+        fresh = [summary for future in futures for summary in future.result()]
+    summaries.update(zip(missing, fresh))
+    if cache is not None:
+        cache.put_many([(keys[i], summaries[i]) for i in missing], PACKAGES)
+    return [(candidates[i][0], summaries[i]) for i in range(len(candidates)) if summaries[i] is not None]
+
+
+def build_package_index(rtl_files, preprocessor, executor=None, jobs=1, cache=None, summaries=None):
+    """
+    PackageIndex of the packages and file-scope typedefs of the tree, built
+    once per run before any file is analyzed, so imports, pkg::NAME values
+    and types from other files resolve in memory. `summaries` are the
+    (file path, summary) pairs of package_summaries(), read from the tree
+    when not given.
+    """
+    packages = PackageIndex()
+    with span("build_package_index", "packages", files=len(rtl_files)) as event:
+        if summaries is None:
+            summaries = package_summaries(rtl_files, preprocessor, executor, jobs, cache)
+        for file_path, summary in summaries:
+            packages.add(summary)
+        event["matches"] = len(packages)
+    return packages
+
+
+def find_rtl_files(directory):
+    rtl_files = []
+    if os.path.isfile(directory):
+        return [(directory, os.path.basename(directory))]
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")] #Skip .asset_cache, .git and other tool directories
         for file_name in files:
             if file_name.endswith(".sv") or file_name.endswith(".v"): #To find all the verilog/SV files in the directory
                 file_path = os.path.join(root, file_name) #To ad the file name to the path
-                
-                control = control_sig_detector(file_path, file_name)
-                total_asset_in_path.extend(control)
-                
-                status = status_sig_detector(file_path, file_name)
-                total_asset_in_path.extend(status)
-                
-                cnfg = cnfg_sig_detector(file_path, file_name)
-                total_asset_in_path.extend(cnfg)
-                
-                data = data_sig_detector(file_path, file_name)
-                total_asset_in_path.extend(data)
-                
-                param = para_sig_detector(file_path, file_name)
-                total_asset_in_path.extend(param)
+                rtl_files.append((file_path, file_name))
+    return rtl_files
+
+
+def detect_chunk(rtl_files, profile=False, hierarchy=False, rules=None, preprocessor=None, packages=None,
+                 uses=False):
+    detect = detect_file_uses if uses else detect_file
+    if not profile:
+        return [detect(file_path, file_name, hierarchy, rules, preprocessor, packages)
+                for file_path, file_name in rtl_files]
+    
+    # Worker side of --profile: the events go back to the main process with the rows
+    profiling.enable()
+    try:
+        results = [detect(file_path, file_name, hierarchy, rules, preprocessor, packages)
+                   for file_path, file_name in rtl_files]
+    finally:
+        profiler = profiling.disable()
+    return results, profiler.events
+
+
+def chunk_results(future):
+    if not profiling.enabled():
+        return future.result()
+    results, events = future.result()
+    profiling.current().merge(events)
+    return results
+
+
+def detect_files(rtl_files, executor=None, jobs=1, hierarchy=False, rules=None, preprocessor=None, packages=None,
+                 uses=False):
+    """
+    Yields the rows of one file at a time, in the order of rtl_files (with
+    hierarchy, (rows, module summaries) pairs; with uses, (that, package
+    uses) pairs, see detect_file_uses). With an executor, files go to the
+    workers in chunks and only a few chunks are in flight at once, so
+    memory stays bounded however large the tree is.
+    """
+    if executor is None:
+        detect = detect_file_uses if uses else detect_file
+        for file_path, file_name in rtl_files:
+            yield detect(file_path, file_name, hierarchy, rules, preprocessor, packages)
+        return
+    
+    chunksize = max(1, min(16, len(rtl_files) // (jobs * 4)))
+    chunks = (rtl_files[i:i + chunksize] for i in range(0, len(rtl_files), chunksize))
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(detect_chunk, chunk, profiling.enabled(), hierarchy, rules, preprocessor,
+                                       packages, uses))
+        if len(pending) >= jobs * 2:
+            yield from chunk_results(pending.popleft())
+    while pending:
+        yield from chunk_results(pending.popleft())
+
+
+def iter_file_assets(directory, jobs=1, cache=None, hierarchy=False, rules=None, preprocessor=None, packages=None,
+                     rtl_files=None, executor=None):
+    # Rows of every RTL file under `directory` (or of rtl_files), one file at a time (see detect_files). A given
+    # executor is used as is and left running; otherwise one is created for this scan when jobs > 1.
+    if rules is None:
+        rules = default_rules()
+    if preprocessor is None:
+        preprocessor = shared_preprocessor()
+    if rtl_files is None:
+        rtl_files = find_rtl_files(directory)
+    pool = None
+    if len(rtl_files) < 2:
+        executor = None  # A single file is analyzed here rather than shipped to a worker
+    elif executor is None and jobs > 1:
+        executor = pool = ProcessPoolExecutor(max_workers=jobs)
+    
+    try:
+        if packages is None:
+            packages = build_package_index(rtl_files, preprocessor, executor, jobs, cache)
+        if cache is None:
+            yield from detect_files(rtl_files, executor, jobs, hierarchy, rules, preprocessor, packages)
+            return
+        
+        # Only files whose content (or the rules, or an included header) changed since the last scan, or that
+        # looked up a package value or type that has changed since, are analyzed. The tree is looked up in
+        # blocks so cached rows are never all held at once.
+        fingerprint = rules_fingerprint(rules)
+        for start in range(0, len(rtl_files), CACHE_BLOCK):
+            block = rtl_files[start:start + CACHE_BLOCK]
+            with span("get_many", "cache", files=len(block)) as event:
+                keys = [cache_key(file_path, file_name, preprocessor, fingerprint) for file_path, file_name in block]
+                results = cache.get_many(keys)
+                summaries = cache.get_many(keys, MODULES) if hierarchy else {}
+                uses = cache.get_many(keys, USES)
+                event["matches"] = len(results)
+            missing = [i for i, key in enumerate(keys)
+                       if key not in results or (hierarchy and key not in summaries)
+                       or not packages.unchanged(uses.get(key))]
+            cache.stale(sum(1 for i in missing if keys[i] in results))
+            fresh = detect_files([block[i] for i in missing], executor, jobs, hierarchy, rules, preprocessor, packages,
+                                 uses=True)
+            fresh_uses = []
+            fresh_results = []
+            for i, (asset_in_file, used) in zip(missing, fresh):
+                fresh_uses.append((keys[i], used))
+                fresh_results.append((keys[i], asset_in_file))
+            if hierarchy:
+                fresh_summaries = [(key, pair[1]) for key, pair in fresh_results]
+                fresh_results = [(key, pair[0]) for key, pair in fresh_results]
+            with span("put_many", "cache", files=len(fresh_results)):
+                cache.put_many(fresh_results)
+                cache.put_many(fresh_uses, USES)
+                if hierarchy:
+                    cache.put_many(fresh_summaries, MODULES)
+                    summaries.update(fresh_summaries)
+            results.update(fresh_results)
+            
+            for key in keys:
+                yield (results[key], summaries[key]) if hierarchy else results[key]
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def asset_detector_individual_file(directory, jobs=1, cache=None):
+    total_asset_in_path = []
+    for asset_in_file in iter_file_assets(directory, jobs, cache):
+        total_asset_in_path.extend(asset_in_file)
                 
     return total_asset_in_path
-                    
-        
-                    
 
-asset_dataset = asset_detector_individual_file(path)
+
+CSV_HEADER = ['Filename', 'Asset', 'width', 'Signal_type', 'Appeared in', 'CIA']
 
 
-def append_to_csv(data, file_path):
-    header = ['Filename', 'Asset', 'width', 'Signal_type', 'Appeared in', 'CIA']
+def asset_record(row):
+    # Detector rows are [asset, width, type, appeared in, file name, CIA]
+    return {
+        'Filename': row[4].lower(),  # or .capitalize(), etc.
+        'Asset': row[0],
+        'width': row[1],
+        'Signal_type': row[2],
+        'Appeared in': row[3],
+        'CIA': row[5]
+    }
+
+
+def iter_scan(path, jobs=1, cache=None, hierarchy=False, rules=None, preprocessor=None, packages=None):
+    """
+    Same as scan(), but yields the records of one file at a time as soon as
+    that file is analyzed. With hierarchy the records propagated through
+    port bindings come last, once every file is in the module index.
+    """
+    if not hierarchy:
+        for asset_in_file in iter_file_assets(path, jobs, cache, rules=rules, preprocessor=preprocessor,
+                                              packages=packages):
+            yield [asset_record(row) for row in asset_in_file if len(row) == 6]
+        return
     
-    save_path = Path(file_path)
-    output_file = save_path / "asset_list.csv"
+    index = ModuleIndex()
+    classified = {}
+    rtl_files = find_rtl_files(path)
+    for (file_path, _), (asset_in_file, summaries) in zip(
+            rtl_files, iter_file_assets(path, jobs, cache, hierarchy, rules, preprocessor, packages, rtl_files)):
+        file_path = os.path.abspath(file_path)
+        index.add(summaries, file_path)
+        classify(classified, asset_in_file, summaries, file_path)
+        yield [asset_record(row) for row in asset_in_file if len(row) == 6]
+    with span("propagate_assets", "hierarchy", modules=len(index.modules)) as event:
+        propagated = propagate_assets(index, classified)
+        event["matches"] = len(propagated)
+    yield [asset_record(row) for row in propagated]
+
+
+def scan(path, jobs=1, cache=None, hierarchy=False, rules=None, preprocessor=None, packages=None):
+    """
+    Runs every detector on the .v/.sv files under `path` (a directory or a
+    single file) and returns one dict per detected asset, keyed by the CSV
+    column names. With hierarchy, classifications are also propagated from
+    module to module through the port bindings of instances across the
+    tree. `rules` replaces the built-in classification rules (see
+    rules.rule_registry.load_rules) and `preprocessor` sets the include
+    dirs and defines (rules.preprocessor.shared_preprocessor). `packages` is
+    the PackageIndex that imports and types are resolved in, by default
+    built from the tree being scanned (build_package_index). Nothing is
+    written to disk unless a ResultCache is given.
+    """
+    return [record for records in iter_scan(path, jobs, cache, hierarchy, rules, preprocessor, packages)
+            for record in records]
+
+
+def write_csv_records(csvfile, batches, header=True):
+    writer = csv.DictWriter(csvfile, fieldnames=CSV_HEADER)
+
+    if header:
+        writer.writeheader()
+
+    # Each batch is flushed as it is written, so the output grows while the scan runs
+    for records in batches:
+        writer.writerows(records)
+        csvfile.flush()
+
+
+def write_jsonl_records(jsonfile, batches):
+    for records in batches:
+        for record in records:
+            jsonfile.write(json.dumps(record) + "\n")
+        jsonfile.flush()
+
+
+def append_to_csv(batches, output_file):
+    # batches: lists of records, e.g. from iter_scan()
+    output_file = Path(output_file)
     
     # Check if the file already exists
     file_exists = output_file.exists()
 
     with open(output_file, 'a', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=header)
-
-        if not file_exists:
-            writer.writeheader()
-
-        for row in data:
-            if len(row) == 6:
-                writer.writerow({
-                    'Filename': row[4].lower(),  # or .capitalize(), etc.
-                    'Asset': row[0],
-                    'width': row[1],
-                    'Signal_type': row[2],
-                    'Appeared in': row[3],
-                    'CIA': row[5]
-                })
-                                    
-append_to_csv(asset_dataset, path)
-print(f" asset_list.csv has been saved to '{path}' directory")
-                    
\ No newline at end of file
+        write_csv_records(csvfile, batches, header=not file_exists)
+
+
+def append_to_jsonl(batches, output_file):
+    with open(output_file, 'a', encoding='utf-8') as jsonfile:
+        write_jsonl_records(jsonfile, batches)
+
+
+def read_records(output_file, output_format):
+    # Records of an earlier run, read back one at a time
+    if output_format == "jsonl":
+        with open(output_file, encoding='utf-8') as jsonfile:
+            for line in jsonfile:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(output_file, newline='') as csvfile:
+            yield from csv.DictReader(csvfile)
+
+
+def record_key(record):
+    return (record['Filename'], record['Asset'], record['Signal_type'], record['Appeared in'])
+
+
+def unique_records(records, seen):
+    for record in records:
+        key = record_key(record)
+        if key not in seen:
+            seen.add(key)
+            yield record
+
+
+def replace_output(batches, output_file, output_format="csv", rescanned=None):
+    """
+    Writes the records to a temporary file next to `output_file`, fsyncs it
+    and renames it over the output, so a reader never sees a partial file.
+    Rows are unique by (Filename, Asset, Signal_type, Appeared in).
+
+    Without `rescanned` the output is overwritten. With it (the lowercased
+    names of the files just scanned) the output is upserted: rows of other
+    files are kept from the existing output and only the rows of rescanned
+    files are replaced.
+    """
+    output_file = Path(output_file)
+    seen = set()
+    
+    kept = []
+    if rescanned is not None and output_file.exists():
+        old_records = (record for record in read_records(output_file, output_format)
+                       if record['Filename'] not in rescanned)
+        kept = [unique_records(old_records, seen)]
+    new = (unique_records(records, seen) for records in batches)
+    
+    fd, temp_name = tempfile.mkstemp(dir=output_file.parent, prefix=output_file.name + ".", suffix=".tmp")
+    try:
+        if output_format == "jsonl":
+            handle = os.fdopen(fd, 'w', encoding='utf-8')
+        else:
+            handle = os.fdopen(fd, 'w', newline='')
+        with handle:
+            if output_format == "jsonl":
+                write_jsonl_records(handle, chain(kept, new))
+            else:
+                write_csv_records(handle, chain(kept, new))
+            os.fsync(handle.fileno())
+        
+        if output_file.exists():
+            shutil.copymode(output_file, temp_name)
+        else:
+            os.chmod(temp_name, 0o644)  # mkstemp creates the file as 0600
+        os.replace(temp_name, output_file)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+
+def default_output(path, output_format):
+    directory = Path(path) if os.path.isdir(path) else Path(path).parent
+    return directory / ("asset_list.csv" if output_format == "csv" else "asset_list.jsonl")
+
+
+WATCH_INTERVAL = 0.5  # Seconds between two polls of the watched files
+
+
+def includers_closure(preprocessor, paths):
+    # Every file that includes one of `paths` (absolute), directly or through other headers
+    seen = set()
+    stack = list(paths)
+    while stack:
+        for source in preprocessor.includers(stack.pop()):
+            if source not in seen:
+                seen.add(source)
+                stack.append(source)
+    return seen
+
+
+def record_line(record):
+    return ",".join(str(record[column]) for column in CSV_HEADER)
+
+
+def watch(path, output_file=None, output_format="csv", jobs=1, cache=None, hierarchy=False, rules=None,
+          preprocessor=None, interval=WATCH_INTERVAL, diff=False, out=None):
+    """
+    Scans `path`, keeps the rows of every file in memory and then polls the
+    stat (mtime, size, inode) of its RTL files and of the headers they
+    include every `interval` seconds. Only a changed file and the files
+    that include a changed header are analyzed again; a change to a
+    package or typedef rebuilds the package index and re-analyzes the tree.
+    After each change `output_file` is atomically rewritten, and with
+    `diff` the removed and added rows are printed ('-'/'+' lines) to `out`.
+    A file that cannot be read (deleted or still being written) is reported
+    and analyzed again at the next poll. Runs until interrupted.
+    """
+    out = out if out is not None else sys.stdout
+    if rules is None:
+        rules = default_rules()
+    if preprocessor is None:
+        preprocessor = shared_preprocessor()
+    rtl_files = find_rtl_files(path)
+    summaries = {file_path: json.loads(json.dumps(summary))
+                 for file_path, summary in package_summaries(rtl_files, preprocessor, cache=cache)}
+    packages = None
+    results = {}  # file path -> rows (with hierarchy, (rows, module summaries))
+    retry = set()  # absolute paths whose last analysis failed
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    
+    def index_packages():
+        listed = [(file_path, summaries[file_path]) for file_path, _ in rtl_files if file_path in summaries]
+        return build_package_index(rtl_files, preprocessor, summaries=listed)
+    
+    def analyze(files):
+        done = 0
+        try:
+            batch = iter_file_assets(path, jobs, cache, hierarchy, rules, preprocessor, packages, files, executor)
+            for (file_path, file_name), result in zip(files, batch):
+                results[file_path] = result
+                preprocessor.include_closure(os.path.abspath(file_path))  # Keeps the include graph current
+                done += 1
+        except OSError as error:
+            if executor is None or len(files) < 2:
+                failed(files[done][0], error)  # Analyzed here, so the file that failed is the next one
+                done += 1
+            # The rest one at a time (a worker does not tell which file of its chunk failed), so only the
+            # unreadable ones wait for the next poll
+            for file_path, file_name in files[done:]:
+                try:
+                    results[file_path] = next(iter_file_assets(path, 1, cache, hierarchy, rules, preprocessor,
+                                                               packages, [(file_path, file_name)]))
+                    preprocessor.include_closure(os.path.abspath(file_path))
+                except OSError as error:
+                    failed(file_path, error)
+    
+    def failed(file_path, error):
+        retry.add(os.path.abspath(file_path))
+        print(f" [{time.strftime('%H:%M:%S')}] cannot analyze '{file_path}' ({error}), retrying at the next poll",
+              file=out, flush=True)
+    
+    def current_records():
+        # The same records, in the same order, as a scan of the tree
+        if not hierarchy:
+            return [asset_record(row) for file_path, _ in rtl_files for row in results.get(file_path, ())
+                    if len(row) == 6]
+        index = ModuleIndex()
+        classified = {}
+        records = []
+        for file_path, _ in rtl_files:
+            if file_path not in results:
+                continue  # Not analyzed yet, see retry
+            rows, modules = results[file_path]
+            index.add(modules, os.path.abspath(file_path))
+            classify(classified, rows, modules, os.path.abspath(file_path))
+            records.extend(asset_record(row) for row in rows if len(row) == 6)
+        records.extend(asset_record(row) for row in propagate_assets(index, classified))
+        return records
+    
+    def publish(records, previous):
+        if output_file is not None:
+            replace_output([records], output_file, output_format)
+        if diff:
+            old_lines = {record_line(record) for record in previous}
+            new_lines = {record_line(record) for record in records}
+            for line in sorted(old_lines - new_lines):
+                print("- " + line, file=out)
+            for line in sorted(new_lines - old_lines):
+                print("+ " + line, file=out)
+    
+    def watched_paths():
+        paths = [os.path.abspath(file_path) for file_path, _ in rtl_files]
+        paths.extend(header for headers in preprocessor.graph.values() for header in headers)
+        return paths
+    
+    try:
+        packages = index_packages()
+        analyze(rtl_files)
+        records = current_records()
+        publish(records, records)
+        states = FileStates(watched_paths())
+        print(f" Watching {len(rtl_files)} files under '{path}' (Ctrl+C to stop)", file=out, flush=True)
+        
+        while True:
+            time.sleep(interval)
+            listed = find_rtl_files(path)
+            by_path = {os.path.abspath(file_path): (file_path, file_name) for file_path, file_name in listed}
+            rtl_files = listed
+            changed, removed = states.poll(watched_paths())
+            if not changed and not removed and not retry:
+                continue
+            start = time.perf_counter()
+            
+            dirty = {changed_path for changed_path in changed if changed_path in by_path}
+            dirty |= retry & by_path.keys()
+            retry.clear()
+            dirty |= includers_closure(preprocessor, changed + removed) & by_path.keys()
+            for removed_path in removed:
+                preprocessor.graph.pop(removed_path, None)
+            for file_path in [file_path for file_path in results if os.path.abspath(file_path) not in by_path]:
+                del results[file_path]
+            
+            # A package or typedef edit can change widths anywhere: rebuild the index and re-analyze the tree
+            package_changed = False
+            for file_path in [file_path for file_path in summaries if os.path.abspath(file_path) not in by_path]:
+                del summaries[file_path]
+                package_changed = True
+            for changed_path in sorted(dirty):
+                file_path, file_name = by_path[changed_path]
+                summary = None
+                try:
+                    if preprocessor.declares_packages(changed_path):
+                        # Compared in JSON form, as summaries read back from the cache are
+                        summary = json.loads(json.dumps(package_chunk([(file_path, file_name)], preprocessor)[0]))
+                except OSError as error:
+                    dirty.discard(changed_path)
+                    failed(file_path, error)
+                    continue
+                if summary != summaries.get(file_path):
+                    package_changed = True
+                    if summary is None:
+                        del summaries[file_path]
+                    else:
+                        summaries[file_path] = summary
+            if package_changed:
+                packages = index_packages()
+                dirty = set(by_path)
+            
+            analyze([(file_path, file_name) for file_path, file_name in rtl_files
+                     if os.path.abspath(file_path) in dirty])
+            previous = records
+            records = current_records()
+            publish(records, previous)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f" [{time.strftime('%H:%M:%S')}] {len(changed) + len(removed)} changed, {len(dirty)} re-analyzed "
+                  f"in {elapsed:.0f} ms", file=out, flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return 0
+
+
+def add_common_options(command):
+    # Options shared by scan and watch
+    command.add_argument("path", help="IP/File directory (or a single .v/.sv file) to scan")
+    command.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes, 0 for one per CPU (default: 1)")
+    command.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv", help="output format (default: csv)")
+    command.add_argument("--hierarchy", action="store_true",
+                         help="index the modules and instances of the whole tree and propagate asset "
+                              "classifications through port bindings")
+    command.add_argument("--rules", action="append", default=[], metavar="FILE",
+                         help="TOML (or YAML) file of classification rules that add to, replace or disable "
+                              "the built-in ones; may be given more than once")
+    command.add_argument("-I", "--include-dir", action="append", default=[], metavar="DIR",
+                         help="directory searched for `include files after the directory of the including "
+                              "file; may be given more than once")
+    command.add_argument("-D", "--define", action="append", default=[], metavar="NAME[=VALUE]",
+                         help="macro defined before every file, for `ifdef variants and `define widths; "
+                              "may be given more than once")
+    command.add_argument("--cache-dir", help="result cache directory (default: .asset_cache in the scanned directory)")
+    command.add_argument("--no-cache", action="store_true", help="analyze every file, without reading or updating the cache")
+    command.add_argument("--clear-cache", action="store_true", help="delete the result cache before scanning")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Detect security assets in Verilog/SystemVerilog files")
+    commands = parser.add_subparsers(dest="command")
+
+    scan_cmd = commands.add_parser("scan", help="scan an IP directory or a single RTL file")
+    add_common_options(scan_cmd)
+    scan_cmd.add_argument("-o", "--out", help="output file (default: asset_list.csv/.jsonl in the scanned directory)")
+    scan_cmd.add_argument("-m", "--mode", choices=["append", "overwrite", "upsert"], default="append",
+                          help="append rows to the output, atomically overwrite it, or replace only the rows "
+                               "of the scanned files (default: append)")
+    scan_cmd.add_argument("--profile", nargs="?", const="", metavar="TRACE",
+                          help="time every file, detector and extraction; print a summary and save a Chrome "
+                               "trace (default: asset_profile.json next to the output)")
+
+    watch_cmd = commands.add_parser("watch", help="scan, then re-analyze only the files that change on disk")
+    add_common_options(watch_cmd)
+    watch_cmd.add_argument("-o", "--out", help="output file, atomically rewritten after every change "
+                                               "(default: asset_list.csv/.jsonl in the scanned directory)")
+    watch_cmd.add_argument("--interval", type=float, default=WATCH_INTERVAL, metavar="SECONDS",
+                           help=f"seconds between two polls of the files (default: {WATCH_INTERVAL})")
+    watch_cmd.add_argument("--diff", action="store_true",
+                           help="print the removed (-) and added (+) rows of every change instead of writing "
+                                "the output file, unless -o is given")
+    return parser
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    if not argv:
+        # Interactive use: ask for the directory like the original tool
+        path = input(r"Enter the IP/File Directory Here: ")
+        argv = ["scan", path]
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    if not os.path.exists(args.path):
+        parser.error(f"no such file or directory: '{args.path}'")
+    
+    try:
+        rules = load_rules(args.rules)
+    except (OSError, ValueError) as error:
+        parser.error(f"cannot load rules: {error}")
+    try:
+        defines = [parse_define(define) for define in args.define]
+    except ValueError as error:
+        parser.error(str(error))
+    preprocessor = shared_preprocessor(args.include_dir, defines)
+    
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+    output_file = Path(args.out) if args.out else default_output(args.path, args.format)
+    
+    cache_dir = Path(args.cache_dir) if args.cache_dir else default_cache_dir(args.path)
+    if args.clear_cache:
+        clear_cache(cache_dir)
+    cache = None if args.no_cache else ResultCache(cache_dir)
+    if args.command == "watch":
+        try:
+            return watch(args.path, None if args.diff and not args.out else output_file, args.format, jobs, cache,
+                         args.hierarchy, rules, preprocessor, args.interval, args.diff)
+        finally:
+            if cache is not None:
+                cache.close()
+    if args.profile is not None:
+        profiling.enable()
+    
+    try:
+        # Rows are written file by file while the scan is still running
+        asset_dataset = iter_scan(args.path, jobs, cache, args.hierarchy, rules, preprocessor)
+        if args.mode == "overwrite":
+            replace_output(asset_dataset, output_file, args.format)
+        elif args.mode == "upsert":
+            rescanned = {file_name.lower() for _, file_name in find_rtl_files(args.path)}
+            replace_output(asset_dataset, output_file, args.format, rescanned)
+        elif args.format == "jsonl":
+            append_to_jsonl(asset_dataset, output_file)
+        else:
+            append_to_csv(asset_dataset, output_file)
+    finally:
+        if cache is not None:
+            cache.close()
+    print(f" {output_file.name} has been saved to '{output_file.parent}' directory")
+    
+    if args.profile is not None:
+        profiler = profiling.disable()
+        trace_file = Path(args.profile) if args.profile else output_file.parent / "asset_profile.json"
+        profiler.write_trace(trace_file)
+        print(profiler.summary())
+        print(f" Profile trace has been saved to '{trace_file}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
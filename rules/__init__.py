@@ -0,0 +1,28 @@
+# -----------------------------------------------------------------------------
+# File Name: __init__.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Asset detection rules for Verilog/SystemVerilog files and the
+#              registry of the detectors by name
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from rules.control_sig import control_sig_detector
+from rules.status_sig import status_sig_detector
+from rules.configuration_sig import cnfg_sig_detector
+from rules.data_sig import data_sig_detector
+from rules.para_sig import para_sig_detector
+
+
+# Every detector takes (file_path, file_name, ctx=None) and returns its rows
+DETECTORS = {
+    "control": control_sig_detector,
+    "status": status_sig_detector,
+    "config": cnfg_sig_detector,
+    "data": data_sig_detector,
+    "param": para_sig_detector,
+}
@@ -0,0 +1,296 @@
+# -----------------------------------------------------------------------------
+# File Name: const_expr.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Constant-expression evaluator over lexer tokens (arithmetic,
+#              shifts, comparisons, ternaries, $clog2 and sized literals) and
+#              the per-module parameter environment that widths resolve against
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from rules import lexer
+
+
+# Binding power of the binary operators, as in the SystemVerilog precedence table
+BINARY_OPERATORS = {
+    "**": 12,
+    "*": 11, "/": 11, "%": 11,
+    "+": 10, "-": 10,
+    "<<": 9, ">>": 9, "<<<": 9, ">>>": 9,
+    "<": 8, "<=": 8, ">": 8, ">=": 8,
+    "==": 7, "!=": 7, "===": 7, "!==": 7,
+    "&": 6,
+    "^": 5, "~^": 5, "^~": 5,
+    "|": 4,
+    "&&": 3,
+    "||": 2,
+}
+TERNARY_POWER = 1
+UNARY_OPERATORS = frozenset(["+", "-", "!", "~"])
+# System functions that only change signedness
+PASS_FUNCTIONS = frozenset(["$signed", "$unsigned"])
+MAX_SHIFT = 4096  # Larger shifts and exponents are not widths; left unresolved
+
+
+class Unresolved(Exception):
+    """Raised inside the evaluator for anything that is not a known constant."""
+
+
+#Start of literals
+def number_value(text):
+    # Value of a decimal or sized literal (8'hff, 'd3, 16, '0); None for x/z, '1 or reals
+    text = text.replace("_", "").replace(" ", "").replace("\t", "").lower()
+    if "'" in text:
+        base_digits = text.split("'", 1)[1].lstrip("s")
+        if not base_digits:
+            return None
+        if base_digits == "0":
+            return 0
+        base = {"b": 2, "o": 8, "d": 10, "h": 16}.get(base_digits[0])
+        try:
+            return int(base_digits[1:], base) if base else None
+        except ValueError:
+            return None
+    return int(text) if text.isdigit() else None
+
+
+def clog2(value):
+    # $clog2: bits needed to index `value` entries, 0 for 0 and 1
+    return (value - 1).bit_length() if value > 1 else 0
+
+
+def expression_text(tokens):
+    # Tokens back to text that the lexer reads into the same tokens
+    return " ".join(token.text for token in tokens)
+
+
+def is_literal(tokens):
+    # True when an expression needs no parameter: numbers, operators and $clog2(...)
+    return all(token.kind != lexer.IDENTIFIER or token.text.startswith("$") for token in tokens)
+#end of literals
+
+
+#Start of evaluator
+class _Evaluator:
+    """
+    Precedence-climbing parser that computes the value while it reads.
+    `lookup(name)` gives the value of a lowercased identifier or None.
+    """
+
+    __slots__ = ("tokens", "pos", "lookup")
+
+    def __init__(self, tokens, lookup):
+        self.tokens = tokens
+        self.pos = 0
+        self.lookup = lookup
+
+    def peek(self):
+        return self.tokens[self.pos].text if self.pos < len(self.tokens) else None
+
+    def take(self, text=None):
+        if self.pos >= len(self.tokens) or (text is not None and self.tokens[self.pos].text != text):
+            raise Unresolved
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expression(self, min_power=0):
+        value = self.unary()
+        while True:
+            text = self.peek()
+            if text == "?" and min_power <= TERNARY_POWER:
+                self.pos += 1
+                when_true = self.expression()
+                self.take(":")
+                when_false = self.expression(TERNARY_POWER)
+                value = when_true if value else when_false
+                continue
+            power = BINARY_OPERATORS.get(text)
+            if power is None or power < min_power:
+                return value
+            self.pos += 1
+            value = binary(text, value, self.expression(power + 1))
+
+    def unary(self):
+        token = self.take()
+        text = token.text
+        if token.kind == lexer.NUMBER:
+            value = number_value(text)
+            if value is None:
+                raise Unresolved
+            return value
+        if token.kind == lexer.OPERATOR and text in UNARY_OPERATORS:
+            value = self.unary()
+            if text == "-":
+                return -value
+            if text == "!":
+                return int(not value)
+            if text == "~":
+                return ~value
+            return value
+        if text == "(":
+            value = self.expression()
+            self.take(")")
+            return value
+        if token.kind == lexer.IDENTIFIER:
+            name = text.lower()
+            if name.startswith("$"):
+                return self.call(name)
+            if self.peek() == "::":
+                self.pos += 1
+                name = name + "::" + self.take().text.lower()  # pkg::NAME
+            value = self.lookup(name)
+            if value is None:
+                raise Unresolved
+            return value
+        raise Unresolved
+
+    def call(self, name):
+        self.take("(")
+        value = self.expression()
+        self.take(")")
+        if name == "$clog2":
+            if value < 0:
+                raise Unresolved
+            return clog2(value)
+        if name in PASS_FUNCTIONS:
+            return value
+        raise Unresolved
+
+
+def binary(op, left, right):
+    if op == "+":
+        return left + right
+    if op == "-":
+        return left - right
+    if op == "*":
+        return left * right
+    if op == "/" or op == "%":
+        if right == 0:
+            raise Unresolved
+        quotient = abs(left) // abs(right)
+        if (left < 0) != (right < 0):
+            quotient = -quotient  # Truncated toward zero, as in Verilog
+        return quotient if op == "/" else left - right * quotient
+    if op == "**":
+        if right < 0 or right > MAX_SHIFT:
+            raise Unresolved
+        return left ** right
+    if op in ("<<", "<<<", ">>", ">>>"):
+        if right < 0 or right > MAX_SHIFT:
+            raise Unresolved
+        return left << right if op[0] == "<" else left >> right
+    if op == "<":
+        return int(left < right)
+    if op == "<=":
+        return int(left <= right)
+    if op == ">":
+        return int(left > right)
+    if op == ">=":
+        return int(left >= right)
+    if op == "==" or op == "===":
+        return int(left == right)
+    if op == "!=" or op == "!==":
+        return int(left != right)
+    if op == "&":
+        return left & right
+    if op == "|":
+        return left | right
+    if op == "^":
+        return left ^ right
+    if op == "~^" or op == "^~":
+        return ~(left ^ right)
+    if op == "&&":
+        return int(bool(left) and bool(right))
+    return int(bool(left) or bool(right))
+
+
+def evaluate(tokens, lookup=lambda name: None):
+    """
+    Integer value of a constant expression such as 'DEPTH*2-1',
+    '$clog2(N) + 1' or 'W > 8 ? 8'd15 : 4', or None when it uses anything
+    that is not a number or a name known to `lookup`.
+    """
+    if not tokens:
+        return None
+    evaluator = _Evaluator(tokens, lookup)
+    try:
+        value = evaluator.expression()
+    except (Unresolved, RecursionError):
+        return None
+    return value if evaluator.pos == len(tokens) else None
+#end of evaluator
+
+
+def import_lookup(imports, package_value):
+    """
+    name -> value through the imports of a scope: 'pkg::NAME' is looked up
+    in pkg, a bare name in every package it is imported from ('import
+    pkg::*' or 'import pkg::NAME'), in import order.
+    """
+    def lookup(name):
+        if "::" in name:
+            package, item = name.split("::", 1)
+            return package_value(package, item)
+        for package, item in imports:
+            if item == "*" or item == name:
+                value = package_value(package, name)
+                if value is not None:
+                    return value
+        return None
+    return lookup
+
+
+class ParamEnv:
+    """
+    The parameters of one module. A parameter is evaluated on its first
+    lookup, after the parameters its value refers to, so declaration order
+    does not matter; every result is kept, so later lookups and repeated
+    range expressions are dict hits. A cyclic definition stays unresolved.
+    Names the module does not declare (imported or pkg::NAME) are passed
+    to `outer`.
+    """
+
+    def __init__(self, parameters, outer=None):
+        self.values = {}      # name -> int, or None when unresolved
+        self.outer = outer
+        self._exprs = {}
+        self._pending = set()
+        self._memo = {}
+        for param in parameters:
+            self._exprs.setdefault(param.name, param.value)  # The first definition wins
+
+    def __contains__(self, name):
+        return name in self._exprs
+
+    def lookup(self, name):
+        if name in self.values:
+            return self.values[name]
+        tokens = self._exprs.get(name)
+        if tokens is None:
+            return self.outer(name) if self.outer is not None else None
+        if name in self._pending:
+            return None
+        self._pending.add(name)
+        value = evaluate(tokens, self.lookup)
+        self._pending.discard(name)
+        self.values[name] = value
+        return value
+
+    def resolve(self):
+        # name -> value of every parameter that has a constant value
+        for name in self._exprs:
+            self.lookup(name)
+        return {name: value for name, value in self.values.items() if value is not None}
+
+    def evaluate(self, tokens):
+        if len(tokens) == 1 and tokens[0].kind == lexer.NUMBER:
+            return number_value(tokens[0].text)
+        key = " ".join(token.text for token in tokens)
+        if key not in self._memo:
+            self._memo[key] = evaluate(tokens, self.lookup)
+        return self._memo[key]
@@ -0,0 +1,376 @@
+# -----------------------------------------------------------------------------
+# File Name: engine.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Single-pass walk over the lexer tokens of a file. Statements,
+#              control expressions and block keywords are handed as events to
+#              every registered handler, so all extractors share one traversal
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import gc
+from itertools import islice
+
+from rules import lexer
+
+
+OPEN_BRACKETS = ("(", "[", "{")
+CLOSE_BRACKETS = (")", "]", "}")
+CONDITION_OPERATORS = frozenset(["==", "!=", "===", "!==", "<=", ">=", "<", ">", "||", "&&"])
+CASE_KEYWORDS = frozenset(["case", "casez", "casex"])
+CONTROL_KEYWORDS = CASE_KEYWORDS | frozenset(["if", "for", "foreach", "while", "repeat", "wait"])
+# Keywords that open or close a block; the statement after them starts fresh
+BLOCK_KEYWORDS = frozenset("""
+    begin end else fork join join_any join_none always always_comb always_ff always_latch initial
+    final generate endgenerate endcase endmodule endpackage endfunction endtask forever do default
+    unique unique0 priority endinterface endclass endprogram endprimitive endchecker endspecify
+    endproperty endsequence endclocking endgroup endtable endconfig
+""".split())
+# Block keywords that may be followed by ': label' (begin : blk, end : blk, endmodule : top)
+LABELED_KEYWORDS = frozenset(keyword for keyword in BLOCK_KEYWORDS
+                             if keyword in ("begin", "fork") or keyword.startswith(("end", "join")))
+# An '=' after these is not a signal assignment
+NON_SIGNAL_KEYWORDS = frozenset(["parameter", "localparam", "defparam", "genvar", "typedef", "import",
+                                 "function", "task", "module"])
+# Keywords of a module header, which ends at its ';' after any 'import ...;' in it
+MODULE_KEYWORDS = frozenset(["module", "macromodule"])
+PROCESS_KEYWORDS = frozenset(["always", "always_comb", "always_ff", "always_latch", "initial", "final"])
+LINE_DIRECTIVES = frozenset(["`define", "`undef", "`include", "`ifdef", "`ifndef", "`elsif", "`timescale",
+                             "`default_nettype", "`line", "`pragma", "`begin_keywords"])
+WINDOW = 8192  # Tokens walk() reads from its stream at a time
+
+
+#Start of token helpers
+def group_end(tokens, i, end=None):
+    # Index just past the bracket group that opens at tokens[i]
+    end = len(tokens) if end is None else end
+    depth = 0
+    for j in range(i, end):
+        token = tokens[j]
+        if token.kind == lexer.PUNCT:
+            if token.text in OPEN_BRACKETS:
+                depth += 1
+            elif token.text in CLOSE_BRACKETS:
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+    return end
+
+
+def token_text(tokens):
+    return "".join(token.text for token in tokens).lower()
+
+
+def condition_operands(tokens):
+    """
+    Operands of an if condition: the condition is split at comparison and
+    logical operators (outside nested parentheses) and '!' is dropped, so
+    'if (!rst_n && (state == IDLE))' gives rst_n, state and idle.
+    """
+    operands = []
+    current = []
+    depth = 0
+
+    def flush():
+        operand = [token for token in current if token.text != "!"]
+        if operand and operand[0].text == "(" and group_end(operand, 0) == len(operand):
+            operands.extend(condition_operands(operand[1:-1]))  # (a == b) as a whole operand
+        elif operand:
+            operands.append(token_text(operand))
+        current.clear()
+
+    for token in tokens:
+        if token.kind == lexer.PUNCT:
+            if token.text in OPEN_BRACKETS:
+                depth += 1
+            elif token.text in CLOSE_BRACKETS:
+                depth -= 1
+        elif depth == 0 and token.kind == lexer.OPERATOR and token.text in CONDITION_OPERATORS:
+            flush()
+            continue
+        current.append(token)
+    flush()
+    return operands
+
+
+def edge_signals(tokens):
+    """
+    Names under posedge/negedge in an event control, lowercased, so
+    '( posedge clk or negedge rst_n )' gives clk and rst_n.
+    """
+    return frozenset(tokens[k + 1].text.lower() for k in range(len(tokens) - 1)
+                     if tokens[k].text in ("posedge", "negedge") and tokens[k + 1].kind == lexer.IDENTIFIER)
+
+
+def assigned_names(lhs):
+    # Signals written by an lvalue: a, a[3:0], {a, b}, or the name in 'wire [3:0] a'
+    names = []
+    depth = 0
+    for k, token in enumerate(lhs):
+        if token.text == "[":
+            depth += 1
+        elif token.text == "]":
+            depth -= 1
+        elif depth == 0 and token.kind == lexer.IDENTIFIER and not (k > 0 and lhs[k - 1].text == "."):
+            names.append(token.text.lower())
+    return names
+#end of token helpers
+
+
+class Handler:
+    """
+    Callbacks of walk(). Every event gets the token window of the walk and
+    indices into it, which are only valid during the event:
+
+    keyword(tokens, i)            -- tokens[i] is a block keyword (begin,
+                                     end, else, always*, initial, endmodule,
+                                     endfunction, ...)
+    control(tokens, i, end)       -- tokens[i] is if/case/for/... and
+                                     tokens[i+1:end] is its parenthesized
+                                     expression
+    timing(tokens, i, end)        -- tokens[i] is '@' or '#' and
+                                     tokens[i+1:end] its event or delay
+    statement(tokens, i, op, end) -- tokens[i:end] is one statement; op is
+                                     the index of its top-level '=' or '<=',
+                                     None if it has none
+
+    A handler overrides the events it needs and keeps its own results.
+    """
+
+    def keyword(self, tokens, i):
+        pass
+
+    def control(self, tokens, i, end):
+        pass
+
+    def timing(self, tokens, i, end):
+        pass
+
+    def statement(self, tokens, i, op, end):
+        pass
+
+
+def walk(tokens, handlers):
+    """
+    One linear walk over `tokens` that feeds every handler, so adding an
+    extractor adds a handler instead of another pass over the file. Returns
+    the number of tokens walked.
+
+    `tokens` is a list or any iterable, such as the output of the
+    preprocessor: it is read WINDOW tokens at a time, and the window is cut
+    at statement boundaries, so a file is never held as one token list.
+
+    Statements are delimited by ';', block keywords and case labels, which
+    keeps multi-line statements and '<=' comparisons inside a condition
+    together. A module header is one statement, 'import ...;' lines in it
+    included. Directive lines, event controls and delays are skipped.
+
+    The cyclic garbage collector is paused during the walk: the tokens
+    only live as long as the window, but would otherwise make it scan the
+    growing AST over and over. They are freed by reference counting.
+    """
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return walk_stream(iter(tokens), handlers)
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def walk_stream(stream, handlers):
+    # The walk() of an iterator
+    keyword_events = tuple(handler.keyword for handler in handlers)
+    control_events = tuple(handler.control for handler in handlers)
+    timing_events = tuple(handler.timing for handler in handlers)
+    statement_events = tuple(handler.statement for handler in handlers)
+
+    window = []
+    walked = 0
+
+    def fill():
+        # Reads more of the stream into the window; False at its end
+        size = len(window)
+        window.extend(islice(stream, WINDOW))
+        return len(window) > size
+
+    def has(k):
+        # True when window[k] exists, once enough of the stream is read
+        while k >= len(window):
+            if not fill():
+                return False
+        return True
+
+    def close(i):
+        # group_end() of the bracket at window[i], reading on until the group closes
+        end = group_end(window, i)
+        while end == len(window) and fill():
+            end = group_end(window, i)
+        return end
+
+    n = 0
+    i = 0
+    while True:
+        if i >= WINDOW:
+            # Statement boundary: drop the walked tokens from the window
+            walked += i
+            del window[:i]
+            i = 0
+        n = len(window)
+        if i >= n:
+            if not fill():
+                break
+            n = len(window)
+        token = window[i]
+        text = token.text
+
+        if token.kind == lexer.DIRECTIVE:
+            i += 1
+            if text in LINE_DIRECTIVES:
+                # `define, `include, ... take the rest of their line
+                while has(i) and window[i].line == token.line:
+                    i += 1
+            continue
+
+        if token.kind == lexer.KEYWORD:
+            if text in CONTROL_KEYWORDS:
+                if has(i + 1) and window[i + 1].text == "(":
+                    end = close(i + 1)
+                    for event in control_events:
+                        event(window, i, end)
+                    i = end
+                else:
+                    i += 1
+                continue
+            if text in BLOCK_KEYWORDS:
+                for event in keyword_events:
+                    event(window, i)
+                i += 1
+                if text in LABELED_KEYWORDS and has(i + 1) and window[i].text == ":":
+                    i += 2  # begin : block_name, end : block_name
+                continue
+
+        if text == "@" or text == "#":
+            # Event control or delay: @(posedge clk), @*, #10, #(1)
+            start = i
+            i += 1
+            if has(i):
+                i = close(i) if window[i].text == "(" else i + 1
+            for event in timing_events:
+                event(window, start, i)
+            continue
+        if text == ":" or text == ";":
+            i += 1
+            continue
+
+        # One statement: up to ';' at depth 0, a case label ':' or the next block keyword
+        op = None
+        depth = 0
+        j = i
+        label = False
+        header = token.kind == lexer.KEYWORD and text in MODULE_KEYWORDS
+        imports = 0  # 'import ...;' lines of a module header not ended yet
+        while True:
+            if j >= n:
+                if not fill():
+                    break
+                n = len(window)
+            t = window[j]
+            if t.kind == lexer.PUNCT:
+                if t.text in OPEN_BRACKETS:
+                    depth += 1
+                elif t.text in CLOSE_BRACKETS:
+                    if depth:
+                        depth -= 1  # A stray closing bracket does not hide the ';' after it
+                elif depth == 0 and t.text == ";":
+                    if not imports:
+                        break
+                    imports -= 1
+                elif depth == 0 and t.text == ":" and op is None:
+                    label = True
+                    break
+            elif t.kind == lexer.OPERATOR:
+                if depth == 0 and op is None and (t.text == "=" or t.text == "<="):
+                    op = j
+            elif t.kind == lexer.KEYWORD:
+                if header and depth == 0 and t.text == "import":
+                    imports += 1
+                elif depth == 0 and j > i and t.text in BLOCK_KEYWORDS:
+                    break  # Only outside brackets, so '{default: 0} stays one expression
+            j += 1
+
+        if label:
+            i = j + 1
+            continue
+
+        for event in statement_events:
+            event(window, i, op, j)
+
+        i = j + 1 if j < n and window[j].text == ";" else max(j, i + 1)
+    return walked + n
+
+
+class StatementFacts(Handler):
+    """
+    The operands of every if condition and case expression, and the [lhs,
+    rhs, constant] of every blocking ('=', 'assign') and non-blocking ('<=')
+    assignment, in file order. If operands that are a posedge/negedge term
+    of the enclosing process (the clock and asynchronous reset of
+    'always @(posedge clk or negedge rst_n)') are left out.
+    """
+
+    def __init__(self):
+        self.if_else = []
+        self.cases = []
+        self.blocking = []
+        self.nblocking = []
+        self.edges = frozenset()    # edge terms in the sensitivity of the open process
+        self.sensitive = False      # the event control after always/initial/final may come next
+
+    def keyword(self, tokens, i):
+        text = tokens[i].text
+        if text in PROCESS_KEYWORDS:
+            self.edges = frozenset()
+            self.sensitive = True
+            return
+        if text == "endmodule" or text == "generate" or text == "endgenerate":
+            self.edges = frozenset()
+        self.sensitive = False
+
+    def timing(self, tokens, i, end):
+        if self.sensitive and tokens[i].text == "@":
+            self.edges = edge_signals(tokens[i + 1:end])
+        self.sensitive = False
+
+    def control(self, tokens, i, end):
+        self.sensitive = False
+        text = tokens[i].text
+        if text == "if":
+            edges = self.edges
+            self.if_else.extend(operand for operand in condition_operands(tokens[i + 2:end - 1])
+                                if operand not in edges)
+        elif text in CASE_KEYWORDS:
+            operand = token_text(tokens[i + 2:end - 1])
+            if operand:
+                self.cases.append(operand)
+
+    def statement(self, tokens, i, op, end):
+        self.sensitive = False
+        if op is None:
+            return
+        lhs = tokens[i:op]
+        rhs = tokens[op + 1:end]
+        is_declaration = any(t.text in NON_SIGNAL_KEYWORDS for t in lhs)
+        if not is_declaration and rhs:
+            rhs_text = token_text(rhs)
+            constant = not any(t.kind == lexer.IDENTIFIER for t in rhs)
+            target = self.nblocking if tokens[op].text == "<=" else self.blocking
+            for name in assigned_names(lhs):
+                target.append([name, rhs_text, constant])
+
+    def result(self):
+        return self.if_else, self.cases, self.blocking, self.nblocking
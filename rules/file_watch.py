@@ -0,0 +1,60 @@
+# -----------------------------------------------------------------------------
+# File Name: file_watch.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Stat-based change detection for watch mode: the last seen
+#              (mtime, size, inode) of every watched file, compared on each poll
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import os
+
+
+def stat_key(path):
+    """
+    (mtime in ns, size, inode) of a file, None when it is gone. An editor
+    that saves by writing a new file and renaming it over the old one
+    changes the inode even when mtime and size happen to match.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class FileStates:
+    """
+    The stat of every watched file as of the last poll. Only os.stat is
+    called per file, so a poll of a large tree takes milliseconds and no
+    file is opened unless it changed.
+    """
+
+    def __init__(self, paths=()):
+        self.states = {}
+        self.poll(paths)
+
+    def poll(self, paths):
+        """
+        Takes a new stat of `paths` (the files to watch now) and returns
+        (changed, removed): the paths that are new or differ from the last
+        poll, and the watched paths that are gone or no longer listed.
+        """
+        states = {}
+        changed = []
+        for path in paths:
+            if path in states:
+                continue
+            state = stat_key(path)
+            if state is None:
+                continue
+            states[path] = state
+            if self.states.get(path) != state:
+                changed.append(path)
+        removed = [path for path in self.states if path not in states]
+        self.states = states
+        return changed, removed
@@ -0,0 +1,205 @@
+# -----------------------------------------------------------------------------
+# File Name: hierarchy.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Project-level analysis across files: a module definition index
+#              and instance graph of the whole tree, and the propagation of
+#              asset classifications through the port bindings of instances
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from collections import deque
+
+from rules.module_ast import get_ast
+from rules.engine import assigned_names
+
+
+CIA_ORDER = "CIA"
+NOT_PROPAGATED = frozenset(["Param"])  # Parameters are not bound to ports
+
+
+def module_summaries(ctx):
+    """
+    What the module index needs from one file, small and JSON-ready so it
+    can come back from a worker process and go into the result cache:
+
+    {"module": name, "file": file name,
+     "ports": [[name, direction, width], ...],
+     "instances": [[module, instance, [[formal, [actual names]], ...]], ...]}
+
+    formal is a port name, a position for ordered connections, or '*'.
+    """
+    summaries = []
+    for module in get_ast(ctx).modules:
+        ports = []
+        for name in module.port_order:
+            port = module.ports.get(name)
+            if port is not None:
+                ports.append([name, port.direction, port.width])
+        instances = []
+        for instance in module.instances:
+            connections = [[formal, assigned_names(actual)] for formal, actual in instance.connections]
+            instances.append([instance.module_name, instance.name, connections])
+        summaries.append({
+            "module": module.name,
+            "file": ctx.file_name,
+            "ports": ports,
+            "instances": instances,
+        })
+    return summaries
+
+
+class ModuleIndex:
+    """
+    Module definitions of a whole tree, filled one file at a time with add()
+    in any order. Each summary is stored with the full path of its file
+    under "path", as file names are not unique in a tree. When a module is
+    defined twice the first definition is used and the others are listed
+    in `duplicates`.
+    """
+
+    def __init__(self):
+        self.modules = {}
+        self.duplicates = []
+        self._parents = None
+
+    def add(self, summaries, path):
+        for summary in summaries:
+            summary = dict(summary, path=path)  # Cached summaries stay free of paths
+            name = summary["module"].lower()
+            if name in self.modules:
+                self.duplicates.append(summary)
+            else:
+                self.modules[name] = summary
+        self._parents = None
+
+    def children(self, name):
+        # (child module, instance name) of every instance in module `name`
+        summary = self.modules.get(name.lower())
+        if summary is None:
+            return []
+        return [(module, instance) for module, instance, connections in summary["instances"]]
+
+    def parents(self, name):
+        # (parent module, instance name) of every instance of module `name`
+        if self._parents is None:
+            self._parents = {}
+            for parent in self.modules.values():
+                for module, instance, connections in parent["instances"]:
+                    self._parents.setdefault(module.lower(), []).append((parent["module"], instance))
+        return self._parents.get(name.lower(), [])
+
+    def top_modules(self):
+        # Defined modules that no other module instantiates
+        return [summary["module"] for name, summary in self.modules.items() if not self.parents(name)]
+
+    def bindings(self):
+        """
+        Yields (parent, child, instance, port, direction, actual names) for
+        every port binding of an instance whose module is defined in the
+        tree. Ordered connections and '.*' are resolved to port names.
+        """
+        for parent in self.modules.values():
+            for module, instance, connections in parent["instances"]:
+                child = self.modules.get(module.lower())
+                if child is None:
+                    continue  # A library cell or a file outside the tree
+                ports = child["ports"]
+                directions = {name: direction for name, direction, width in ports}
+                for formal, actuals in connections:
+                    if formal == "*":
+                        for name, direction, width in ports:
+                            yield parent, child, instance, name, direction, [name]
+                        continue
+                    if isinstance(formal, int):
+                        if formal >= len(ports):
+                            continue
+                        formal = ports[formal][0]
+                    if formal in directions:
+                        yield parent, child, instance, formal, directions[formal], actuals
+
+
+def bound_names(summary):
+    # Ports and connected signals of a module, the only names propagation can reach
+    names = set(name for name, direction, width in summary["ports"])
+    for module, instance, connections in summary["instances"]:
+        for formal, actuals in connections:
+            names.update(actuals)
+    return names
+
+
+def classify(classified, asset_in_file, summaries, path):
+    """
+    Records the detector rows of one file that a port binding can carry:
+    classified[(file path, module, signal)] -> {signal type: [width, CIA
+    letters]}. Rows name no module, so a signal goes to the modules of the
+    file that have it as a port, or else to every module that binds it.
+    """
+    bound = [(summary["module"], {name for name, direction, width in summary["ports"]}, bound_names(summary))
+             for summary in summaries]
+    for row in asset_in_file:
+        if len(row) != 6 or row[2] in NOT_PROPAGATED:
+            continue
+        asset, width, signal_type, appeared_in, file_name, cia = row
+        modules = [module for module, ports, names in bound if asset in ports] or \
+                  [module for module, ports, names in bound if asset in names]
+        for module in modules:
+            types = classified.setdefault((path, module, asset), {})
+            known = types.get(signal_type)
+            if known is None:
+                types[signal_type] = [width, set(cia)]
+            else:
+                known[1].update(cia)
+
+
+def cia_text(letters):
+    return "".join(letter for letter in CIA_ORDER if letter in letters)
+
+
+def propagate_assets(index, classified):
+    """
+    Pushes classifications through port bindings until nothing changes:
+    from a parent signal into the input of the instance it drives, and from
+    an instance output into the parent signal it drives (inout both ways).
+    Returns the new rows, [asset, width, type, 'port binding(parent.instance)',
+    file name, CIA], for every signal that gained a type or CIA letters.
+    """
+    edges = {}
+    file_names = {}
+    for parent, child, instance, port, direction, actuals in index.bindings():
+        via = f"port binding({parent['module']}.{instance})"
+        port_width = next((width for name, _, width in child["ports"] if name == port), None)
+        file_names[parent["path"]] = parent["file"]
+        file_names[child["path"]] = child["file"]
+        for actual in actuals:
+            upper = (parent["path"], parent["module"], actual)
+            lower = (child["path"], child["module"], port)
+            if direction in ("input", "inout"):
+                edges.setdefault(upper, []).append((lower, port_width, via))
+            if direction in ("output", "inout"):
+                edges.setdefault(lower, []).append((upper, None, via))
+
+    new_rows = {}
+    queue = deque(source for source in classified if source in edges)
+    while queue:
+        source = queue.popleft()
+        for target, width, via in edges.get(source, ()):
+            types = classified.setdefault(target, {})
+            changed = False
+            for signal_type, (source_width, letters) in list(classified[source].items()):
+                known = types.get(signal_type)
+                if known is not None and letters <= known[1]:
+                    continue
+                merged = set(letters) if known is None else known[1] | letters
+                target_width = width if width is not None else source_width
+                types[signal_type] = [target_width, merged]
+                new_rows[(target, signal_type)] = [target[2], target_width, signal_type, via,
+                                                   file_names[target[0]], cia_text(merged)]
+                changed = True
+            if changed:
+                queue.append(target)
+    return list(new_rows.values())
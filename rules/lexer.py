@@ -0,0 +1,130 @@
+# -----------------------------------------------------------------------------
+# File Name: lexer.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Single-pass tokenizer for Verilog/SystemVerilog. Turns a file
+#              into a stream of tokens (kind, text, line, col) with comments,
+#              strings, based numbers, directives and operators recognized
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import re
+
+
+# Token kinds
+COMMENT = "comment"
+DIRECTIVE = "directive"    # `define, `ifdef, `include, `MACRO ...
+STRING = "string"
+NUMBER = "number"          # 8'hff, 'b1, 4'sd3, 1.5e3, 42
+KEYWORD = "keyword"
+IDENTIFIER = "identifier"  # plain, escaped (\bus[0] ) and $system names
+OPERATOR = "operator"
+PUNCT = "punct"            # ( ) [ ] { } ; , . : # @ ?
+UNKNOWN = "unknown"
+
+KEYWORDS = frozenset("""
+    always always_comb always_ff always_latch and assign automatic begin bit buf byte case casex casez
+    cmos const deassign default defparam disable do edge else end endcase endchecker endclass
+    endclocking endconfig endfunction endgenerate endgroup endinterface endmodule endpackage
+    endprimitive endprogram endproperty endsequence endspecify endtable endtask enum
+    event export extern final for force forever fork function generate genvar if iff import
+    initial inout input int integer interface join join_any join_none localparam logic longint
+    macromodule module nand negedge nmos nor not or output package packed parameter posedge
+    primitive priority program pulldown pullup real realtime reg release repeat return rtranif0
+    shortint shortreal signed specify static string struct supply0 supply1 task time tran tranif0
+    tranif1 tri tri0 tri1 triand trior trireg typedef union unique unique0 unsigned void wait wand
+    while wire wor xnor xor
+""".split())
+
+# Each match skips the blanks before a token; a line break is a match of its
+# own so lines are counted without searching the gaps. The alternatives are
+# ordered by how often they occur in RTL; within an alternative the longest
+# operator comes first, so '<<<=' is never read as '<<' '<='. Attribute
+# instances, (* keep *), are skipped like comments; '@(*)' is not one. The
+# pattern works on bytes, so an mmap of the file is scanned in place.
+_TOKEN = re.compile(rb"""[ \t\r\f\v]*(?:
+      (?P<newline>\n)
+    | (?P<identifier>[a-zA-Z_][\w$]*|\$[\w$]+|\\\S+)
+    | (?P<attribute>\(\*(?!\s*\))[^;]*?\*\))
+    | (?P<punct>[()\[\]{};,.\#@?])
+    | (?P<number>\d[\d_]*(?:[ \t]*'[sS]?[bBoOdDhH][ \t]*[0-9a-fA-FxXzZ?_]+
+                           | \.\d[\d_]*(?:[eE][+-]?\d+)?
+                           | [eE][+-]?\d+)?
+                | '[sS]?[bBoOdDhH][ \t]*[0-9a-fA-FxXzZ?_]+
+                | '[01xXzZ](?![\w']))
+    | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<operator><<<=|>>>=|===|!==|==\?|!=\?|<->|<<<|>>>|<<=|>>=|[-+*/%&|^]=|\+\+|--|\*\*|->|=>
+                  |<=|>=|==|!=|&&|\|\||<<|>>|~[&|^]|\^~|[-+]:|::|[=<>+\-*/%&|^~!])
+    | (?P<string>"(?:\\.|[^"\\\n])*"?)
+    | (?P<directive>`\w+)
+    | (?P<late_punct>[:'])       # after the operators and numbers that start with them
+    | (?P<unknown>\S)
+)""", re.VERBOSE | re.DOTALL)
+
+ENCODING = "utf-8"
+
+
+class Token:
+    __slots__ = ("kind", "text", "line", "col")
+
+    def __init__(self, kind, text, line, col):
+        self.kind = kind
+        self.text = text
+        self.line = line  # 1-based
+        self.col = col    # 0-based, in bytes
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.text!r}, {self.line}:{self.col})"
+
+
+def tokenize(code, keep_comments=False):
+    # Tokens of `code` as a list (see iter_tokens)
+    return list(iter_tokens(code, keep_comments))
+
+
+def iter_tokens(code, keep_comments=False):
+    """
+    Tokens of `code` (bytes, an mmap or str) in file order, produced one at
+    a time. Whitespace is dropped, and so are comments unless keep_comments
+    is set. Anything that is not valid Verilog becomes an UNKNOWN token;
+    the lexer never fails.
+
+    Only the token texts are decoded, and every distinct text once: the
+    tokens of a name share one string however often it occurs.
+    """
+    if isinstance(code, str):
+        code = code.encode(ENCODING)
+    texts = {}
+    line = 1
+    line_start = 0
+    for match in _TOKEN.finditer(code):
+        kind = match.lastgroup
+        if kind == "newline":
+            line += 1
+            line_start = match.end()
+            continue
+
+        raw = match.group(kind)
+        end = match.end()
+        if kind == "comment" or kind == "attribute":
+            if keep_comments and kind == "comment":
+                yield Token(kind, raw.decode(ENCODING, "ignore"), line, end - len(raw) - line_start)
+            breaks = raw.count(b"\n")
+            if breaks:
+                line += breaks
+                line_start = end - len(raw) + raw.rfind(b"\n") + 1
+            continue
+
+        text = texts.get(raw)
+        if text is None:
+            text = texts[raw] = raw.decode(ENCODING, "ignore")
+        if kind == "identifier":
+            if text in KEYWORDS:
+                kind = KEYWORD
+        elif kind == "late_punct":
+            kind = PUNCT
+        yield Token(kind, text, line, end - len(raw) - line_start)
@@ -0,0 +1,926 @@
+# -----------------------------------------------------------------------------
+# File Name: module_ast.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Lightweight structural parser over the lexer tokens. Builds a
+#              per-file AST of modules with their ANSI/non-ANSI ports, nets,
+#              parameters, always/assign blocks and instances
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from rules import lexer
+from rules.const_expr import ParamEnv, expression_text, import_lookup, is_literal
+from rules.type_index import TypeIndex
+from rules.engine import OPEN_BRACKETS, CLOSE_BRACKETS, MODULE_KEYWORDS, PROCESS_KEYWORDS, Handler, group_end, walk
+
+
+DIRECTIONS = frozenset(["input", "output", "inout", "ref"])
+NET_TYPES = frozenset("""
+    wire reg logic bit tri tri0 tri1 triand trior trireg wand wor uwire supply0 supply1 var
+    integer int byte shortint longint time real realtime shortreal
+""".split())
+# Width of the types that do not take a range
+TYPE_WIDTHS = {"integer": 32, "int": 32, "byte": 8, "shortint": 16, "longint": 64, "time": 64}
+NO_WIDTH_TYPES = frozenset(["real", "realtime", "shortreal", "string"])
+AGGREGATE_KEYWORDS = frozenset(["struct", "union"])
+SKIPPED_BLOCKS = {"function": "endfunction", "task": "endtask", "class": "endclass", "specify": "endspecify"}
+# Statements that start a new module item, which ends an open process
+ITEM_KEYWORDS = DIRECTIONS | NET_TYPES | frozenset(SKIPPED_BLOCKS) | frozenset([
+    "parameter", "localparam", "defparam", "assign", "typedef", "genvar", "import"])
+
+
+class Declaration:
+    """
+    One declared port or net.
+
+    direction  -- input/output/inout, None for a net
+    kind       -- net/variable type keyword (wire, reg, logic, ...) or None
+    type_name  -- user-defined type (state_t, pkg::word_t), if any
+    dims       -- packed dimensions as (msb tokens, lsb tokens)
+    unpacked   -- unpacked dimensions after the name, same form
+    width      -- total bits (every element of an array, the whole layout of
+                  a typedef), with parameter ranges resolved; None if unknown
+    literal    -- True when the width came from literal ranges only
+    """
+
+    __slots__ = ("name", "direction", "kind", "type_name", "signed", "dims", "unpacked", "width", "literal",
+                 "line")
+
+    def __init__(self, name, direction, kind, type_name, signed, dims, line, unpacked=()):
+        self.name = name
+        self.direction = direction
+        self.kind = kind
+        self.type_name = type_name
+        self.signed = signed
+        self.dims = dims
+        self.unpacked = unpacked
+        self.line = line
+        self.width = None
+        self.literal = False
+
+    def __repr__(self):
+        return f"Declaration({self.direction or self.kind} {self.name}, width={self.width}, line {self.line})"
+
+
+class Parameter:
+    __slots__ = ("name", "kind", "is_bit", "value", "dims", "line")
+
+    def __init__(self, name, kind, is_bit, value, dims, line):
+        self.name = name
+        self.kind = kind          # parameter, localparam or enum (a named enum value)
+        self.is_bit = is_bit      # 'parameter bit NAME = ...'
+        self.value = value        # value tokens
+        self.dims = dims
+        self.line = line
+
+    def __repr__(self):
+        return f"Parameter({self.kind} {self.name}, line {self.line})"
+
+
+class TypeDef:
+    """
+    A typedef, or an anonymous struct/union/enum inside one. kind is alias,
+    enum, struct or union; fields holds (base, dims) per member (a single
+    one for alias and enum), where base is the width of a built-in type, a
+    type name, a nested TypeDef or None, and dims its packed and unpacked
+    dimensions. record() evaluates the dimensions for the TypeIndex. An
+    enum keeps its named values in `constants` (Parameters of kind enum).
+    """
+
+    __slots__ = ("name", "kind", "fields", "line", "constants")
+
+    def __init__(self, name, kind, fields, line, constants=()):
+        self.name = name
+        self.kind = kind
+        self.fields = fields
+        self.line = line
+        self.constants = constants
+
+    def layout(self, env):
+        fields = []
+        for base, dims in self.fields:
+            if isinstance(base, TypeDef):
+                base = base.layout(env)
+            count = dims_width(dims, env)[0]
+            if count is None:
+                # Left to the TypeIndex: the dimensions may use a name from another file
+                count = [[expression_text(msb), None if lsb is None else expression_text(lsb)] for msb, lsb in dims]
+            fields.append([base, count])
+        return [self.kind, fields]
+
+    def record(self, env):
+        # [name, kind, [[base, count], ...]] with the dimensions evaluated in `env`
+        return [self.name] + self.layout(env)
+
+    def __repr__(self):
+        return f"TypeDef({self.kind} {self.name}, line {self.line})"
+
+
+class Block:
+    """
+    A process (always*, initial, final) or a continuous assign, with the
+    event control after the '@' of a process ('( posedge clk )', '*') as
+    its sensitivity.
+    """
+
+    __slots__ = ("kind", "line", "sensitivity")
+
+    def __init__(self, kind, line, sensitivity=""):
+        self.kind = kind
+        self.line = line
+        self.sensitivity = sensitivity
+
+    def __repr__(self):
+        return f"Block({self.kind}, line {self.line})"
+
+
+class Instance:
+    """
+    One instantiation of another module. connections holds (formal, actual
+    tokens) per port binding: formal is the port name for '.port(expr)' and
+    '.port', its position for ordered connections, and '*' for '.*'.
+    """
+
+    __slots__ = ("module_name", "name", "line", "connections")
+
+    def __init__(self, module_name, name, line, connections):
+        self.module_name = module_name
+        self.name = name
+        self.line = line
+        self.connections = connections
+
+    def __repr__(self):
+        return f"Instance({self.module_name} {self.name}, line {self.line})"
+
+
+class Module:
+    """
+    port_order   -- port names in header order (ANSI and non-ANSI)
+    ports        -- name -> Declaration of the port direction
+    declarations -- every port and net Declaration, in file order
+    parameters   -- Parameter list, header #(...) first
+    param_values -- name -> value of the parameters, set when the module ends
+    typedefs     -- TypeDefs declared in the module body
+    enums        -- Parameters of kind enum, the values of its enum typedefs
+    imports      -- (package, name or '*') of the file-scope, header and body imports
+    blocks       -- always/initial/final/assign Blocks
+    instances    -- module instantiations
+    """
+
+    def __init__(self, name, line):
+        self.name = name
+        self.line = line
+        self.end_line = line
+        self.ansi = False
+        self.port_order = []
+        self.ports = {}
+        self.declarations = []
+        self.parameters = []
+        self.blocks = []
+        self.instances = []
+        self.typedefs = []
+        self.enums = []
+        self.imports = []
+        self.param_values = {}  # name -> int, for the parameters with a constant value
+        self.env = None         # ParamEnv the widths were resolved in
+
+    def __repr__(self):
+        return f"Module({self.name}, {len(self.port_order)} ports, line {self.line})"
+
+
+class Package:
+    """
+    A 'package NAME; ... endpackage' with its parameters, typedefs, enum
+    values and imports. The values and type records are resolved when the
+    package ends.
+    """
+
+    def __init__(self, name, line):
+        self.name = name
+        self.line = line
+        self.parameters = []
+        self.typedefs = []
+        self.enums = []
+        self.imports = []
+        self.param_values = {}
+        self.env = None
+
+    def __repr__(self):
+        return f"Package({self.name}, line {self.line})"
+
+
+class SourceAst:
+    """
+    modules      -- Modules of the file, in file order
+    packages     -- Packages of the file
+    type_records -- (package name or None, record) of every typedef outside
+                    a module, for the tree-wide TypeIndex
+    types        -- TypeIndex of those typedefs over the tree-wide one
+    token_count  -- number of tokens the AST was built from
+    """
+
+    def __init__(self, types=None):
+        self.modules = []
+        self.packages = []
+        self.type_records = []
+        self.types = TypeIndex(outer=types)
+        self.token_count = 0
+
+    def package(self, name):
+        for package in self.packages:
+            if package.name == name:
+                return package
+        return None
+
+    def module(self, name):
+        for module in self.modules:
+            if module.name == name:
+                return module
+        return None
+
+
+#Start of helpers
+def find_semicolon(tokens, i, end):
+    # Index of the ';' that ends the item starting at tokens[i], at bracket depth 0
+    depth = 0
+    for j in range(i, end):
+        token = tokens[j]
+        if token.kind == lexer.PUNCT:
+            if token.text in OPEN_BRACKETS:
+                depth += 1
+            elif token.text in CLOSE_BRACKETS:
+                depth -= 1
+            elif token.text == ";" and depth <= 0:
+                return j
+    return end
+
+
+def split_commas(tokens, start, end):
+    # (start, end) of every comma separated item at bracket depth 0
+    items = []
+    depth = 0
+    item_start = start
+    for j in range(start, end):
+        token = tokens[j]
+        if token.kind == lexer.PUNCT:
+            if token.text in OPEN_BRACKETS:
+                depth += 1
+            elif token.text in CLOSE_BRACKETS:
+                depth -= 1
+            elif token.text == "," and depth == 0:
+                items.append((item_start, j))
+                item_start = j + 1
+    if item_start < end:
+        items.append((item_start, end))
+    return items
+
+
+def dims_width(dims, env):
+    """
+    (width, literal) of packed dimensions: the product of every |msb-lsb|+1,
+    with the bounds evaluated in the module's ParamEnv. `literal` is True
+    when no parameter was needed.
+    """
+    width = 1
+    literal = True
+    for msb_tokens, lsb_tokens in dims:
+        msb = env.evaluate(msb_tokens)
+        if lsb_tokens is None:
+            size = msb
+            literal = literal and is_literal(msb_tokens)
+        else:
+            lsb = env.evaluate(lsb_tokens)
+            size = None if msb is None or lsb is None else abs(msb - lsb) + 1
+            literal = literal and is_literal(msb_tokens) and is_literal(lsb_tokens)
+        if size is None:
+            return None, False
+        width *= size
+    return width, literal
+#end of helpers
+
+
+#Start of declarations
+def parse_declaration_header(tokens, start, end):
+    """
+    Reads 'input wire signed [7:0][3:0]' at the start of a declaration item.
+    Returns (header, index of the name) where header is None when the item
+    is just a name that continues the previous declaration.
+    """
+    direction = None
+    kind = None
+    type_name = None
+    signed = False
+    dims = []
+    j = start
+    while j < end:
+        token = tokens[j]
+        text = token.text
+        if text in DIRECTIONS:
+            direction = text
+        elif text in NET_TYPES:
+            kind = text
+        elif text == "signed" or text == "unsigned":
+            signed = text == "signed"
+        elif text == "[":
+            close = group_end(tokens, j, end)
+            dims.append(split_range(tokens, j + 1, close - 1))
+            j = close
+            continue
+        elif token.kind == lexer.IDENTIFIER and j + 2 < end and tokens[j + 1].text == "::":
+            type_name = token.text + "::" + tokens[j + 2].text  # pkg::type_t
+            j += 3
+            continue
+        elif token.kind == lexer.IDENTIFIER and j + 1 < end and tokens[j + 1].kind == lexer.IDENTIFIER:
+            type_name = text  # user-defined type
+        elif token.kind == lexer.IDENTIFIER and j + 1 < end and tokens[j + 1].text == "[" \
+                and tokens[skip_dims(tokens, j + 1, end)].kind == lexer.IDENTIFIER:
+            type_name = text  # user-defined type with packed dimensions: word_t [3:0] words
+        else:
+            break
+        j += 1
+
+    if j == start:
+        return None, j
+    return (direction, kind, type_name, signed, dims), j
+
+
+def skip_dims(tokens, j, end):
+    # Index past the [..][..] dimensions at tokens[j] (at most end - 1)
+    while j < end and tokens[j].text == "[":
+        j = group_end(tokens, j, end)
+    return min(j, end - 1)
+
+
+def split_range(tokens, start, end):
+    # [msb:lsb] -> (msb tokens, lsb tokens); a size [n] -> (n tokens, None)
+    depth = 0
+    ternaries = 0  # '?' waiting for their ':'
+    for j in range(start, end):
+        text = tokens[j].text
+        if text in OPEN_BRACKETS:
+            depth += 1
+        elif text in CLOSE_BRACKETS:
+            depth -= 1
+        elif text == "?" and depth == 0:
+            ternaries += 1
+        elif text == ":" and depth == 0:
+            if ternaries:
+                ternaries -= 1
+                continue
+            return tokens[start:j], tokens[j + 1:end]
+    return tokens[start:end], None
+
+
+def parse_declarations(tokens, start, end, header=None):
+    """
+    Declarations of one 'input [7:0] a, b' / 'wire x = y, z' list. Items
+    without their own header inherit the previous one, as in an ANSI port
+    list. Returns the Declarations and the last header; their widths are
+    resolved when the module ends (resolve_module).
+    """
+    declarations = []
+    for item_start, item_end in split_commas(tokens, start, end):
+        item_header, j = parse_declaration_header(tokens, item_start, item_end)
+        if item_header is not None:
+            if header is not None and item_header[0] is None and item_header[1] is None \
+                    and item_header[2] is None and not item_header[4]:
+                item_header = header  # only 'signed' - keep the rest
+            header = item_header
+        if header is None or j >= item_end or tokens[j].kind != lexer.IDENTIFIER:
+            continue
+        direction, kind, type_name, signed, dims = header
+        declarations.append(Declaration(tokens[j].text.lower(), direction, kind, type_name, signed, dims,
+                                        tokens[j].line, unpacked_dims(tokens, j + 1, item_end)))
+    return declarations, header
+
+
+def unpacked_dims(tokens, j, end):
+    # The [..] dimensions after a declared name: mem [0:255], key [4]
+    dims = []
+    while j < end and tokens[j].text == "[":
+        close = group_end(tokens, j, end)
+        dims.append(split_range(tokens, j + 1, close - 1))
+        j = close
+    return dims
+
+
+def resolve_width(declaration, env, types):
+    """
+    Bits of a declaration: the element width (a built-in type, or a type
+    name looked up in `types`) times every packed and unpacked dimension.
+    """
+    count, literal = dims_width(declaration.dims, env)
+    if declaration.unpacked and count is not None:
+        elements, unpacked_literal = dims_width(declaration.unpacked, env)
+        count = None if elements is None else count * elements
+        literal = literal and unpacked_literal
+    if declaration.type_name is not None:
+        element = types.width(declaration.type_name.lower())
+        literal = False
+    elif declaration.kind in NO_WIDTH_TYPES:
+        element = None
+    else:
+        element = TYPE_WIDTHS.get(declaration.kind, 1)
+    if element is None or count is None:
+        declaration.width = None
+        declaration.literal = False
+    else:
+        declaration.width = element * count
+        declaration.literal = literal
+
+
+def base_width(kind):
+    # Width of a built-in type keyword, None for real/string
+    return None if kind in NO_WIDTH_TYPES else TYPE_WIDTHS.get(kind, 1)
+
+
+def parse_type(tokens, j, end):
+    """
+    The data type at tokens[j]: 'logic signed [7:0]', 'pkg::word_t [3:0]',
+    'enum logic [1:0] {...}' or 'struct packed {...}'. Returns (base, packed
+    dims, index past the type) with base as in TypeDef.fields.
+    """
+    if j < end and tokens[j].text in AGGREGATE_KEYWORDS:
+        kind = tokens[j].text
+        line = tokens[j].line
+        while j < end and tokens[j].text != "{":  # packed, signed, tagged
+            j += 1
+        close = group_end(tokens, j, end)
+        fields = parse_fields(tokens, j + 1, close - 1)
+        return TypeDef(None, kind, fields, line), unpacked_dims(tokens, close, end), close
+    if j < end and tokens[j].text == "enum":
+        line = tokens[j].line
+        j += 1
+        base, dims = TYPE_WIDTHS["int"], []  # An enum without a base type is an int
+        if j < end and tokens[j].text != "{":
+            base, dims, j = parse_type(tokens, j, end)
+        constants = []
+        close = j
+        if j < end and tokens[j].text == "{":
+            close = group_end(tokens, j, end)
+            constants = enum_constants(tokens, j + 1, close - 1)
+        typedef = TypeDef(None, "enum", [(base, dims)], line, constants)
+        return typedef, unpacked_dims(tokens, close, end), close
+
+    header, k = parse_declaration_header(tokens, j, end)
+    if header is None:
+        return None, [], j
+    direction, kind, type_name, signed, dims = header
+    if type_name is not None:
+        return type_name.lower(), dims, k
+    if kind is None and not dims:
+        return None, [], k
+    return base_width(kind), dims, k
+
+
+def enum_constants(tokens, start, end):
+    """
+    The names of an enum body 'IDLE, LOAD = 2, RUN' as Parameters of kind
+    enum. A name without a value is the previous one plus one.
+    """
+    constants = []
+    previous = None
+    for item_start, item_end in split_commas(tokens, start, end):
+        token = tokens[item_start]
+        if token.kind != lexer.IDENTIFIER:
+            continue
+        if item_start + 1 < item_end and tokens[item_start + 1].text == "=":
+            value = tokens[item_start + 2:item_end]
+        elif previous is None:
+            value = [lexer.Token(lexer.NUMBER, "0", token.line, token.col)]
+        else:
+            value = [lexer.Token(lexer.PUNCT, "(", token.line, token.col)] + previous + [
+                lexer.Token(lexer.PUNCT, ")", token.line, token.col),
+                lexer.Token(lexer.OPERATOR, "+", token.line, token.col),
+                lexer.Token(lexer.NUMBER, "1", token.line, token.col)]
+        constants.append(Parameter(token.text.lower(), "enum", False, value, [], token.line))
+        previous = value
+    return constants
+
+
+def parse_import(tokens, start, end):
+    # (package, name or '*') of every item of 'import a_pkg::*, b_pkg::WIDTH;'
+    imports = []
+    for item_start, item_end in split_commas(tokens, start + 1, end):
+        if item_start + 2 < item_end and tokens[item_start + 1].text == "::":
+            imports.append((tokens[item_start].text.lower(), tokens[item_start + 2].text.lower()))
+    return imports
+
+
+def parse_fields(tokens, start, end):
+    # (base, dims) of every member of a struct/union body: 'logic [7:0] a, b; key_t k;'
+    fields = []
+    i = start
+    while i < end:
+        close = find_semicolon(tokens, i, end)
+        base, dims, j = parse_type(tokens, i, close)
+        for item_start, item_end in split_commas(tokens, j, close):
+            if tokens[item_start].kind == lexer.IDENTIFIER:
+                fields.append((base, dims + unpacked_dims(tokens, item_start + 1, item_end)))
+        i = close + 1
+    return fields
+
+
+def parse_typedef(tokens, start, end):
+    # TypeDef of 'typedef <type> name [dims];', None for a forward declaration
+    base, dims, j = parse_type(tokens, start + 1, end)
+    if base is None or j >= end or tokens[j].kind != lexer.IDENTIFIER:
+        return None
+    name = tokens[j].text.lower()
+    dims = dims + unpacked_dims(tokens, j + 1, end)
+    if isinstance(base, TypeDef) and not dims:
+        base.name = name
+        return base
+    return TypeDef(name, "alias", [(base, dims)], tokens[start].line)
+
+
+def parse_parameters(tokens, start, end, module, kind="parameter"):
+    """
+    'parameter [7:0] A = 1, B = 2' or a header '#(parameter A = 1, localparam
+    B = A)'. Items without a keyword keep the previous kind. The values
+    are evaluated when the module ends (resolve_module).
+    """
+    for item_start, item_end in split_commas(tokens, start, end):
+        j = item_start
+        is_bit = False
+        dims = []
+        while j < item_end:
+            token = tokens[j]
+            text = token.text
+            if text == "parameter" or text == "localparam":
+                kind = text
+            elif text == "bit":
+                is_bit = True
+            elif text == "type":
+                break  # type parameters carry no value
+            elif text == "[":
+                close = group_end(tokens, j, item_end)
+                dims.append(split_range(tokens, j + 1, close - 1))
+                j = close
+                continue
+            elif token.kind == lexer.KEYWORD or (token.kind == lexer.IDENTIFIER and j + 1 < item_end
+                                                 and tokens[j + 1].kind == lexer.IDENTIFIER):
+                pass  # int, logic, signed, user types
+            else:
+                break
+            j += 1
+        if j >= item_end or tokens[j].kind != lexer.IDENTIFIER or tokens[j].text == "type":
+            continue
+        name = tokens[j].text.lower()
+        value = []
+        if j + 1 < item_end and tokens[j + 1].text == "=":
+            value = tokens[j + 2:item_end]
+        module.parameters.append(Parameter(name, kind, is_bit and not dims, value, dims, tokens[j].line))
+    return kind
+
+
+def resolve_module(module, types, package_value):
+    """
+    Resolves the parameter environment of a finished module once, in
+    dependency order, then its typedefs (over the file's `types`) and the
+    width of every declaration against both. Names the module does not
+    declare are resolved through its imports with package_value(package,
+    name).
+    """
+    env = ParamEnv(module.parameters + module.enums, import_lookup(module.imports, package_value))
+    module.param_values = env.resolve()
+    if module.typedefs or module.imports:
+        types = TypeIndex([typedef.record(env) for typedef in module.typedefs], types, module.imports)
+    for declaration in module.declarations:
+        resolve_width(declaration, env, types)
+    module.env = env
+
+
+def resolve_package(package, types, package_value):
+    # Parameters and typedefs of a finished package; the records join the file's `types`
+    package.env = ParamEnv(package.parameters + package.enums, import_lookup(package.imports, package_value))
+    package.param_values = package.env.resolve()
+    records = [typedef.record(package.env) for typedef in package.typedefs]
+    types.add(records, package.name)
+    return records
+#end of declarations
+
+
+#Start of modules
+def parse_port_list(tokens, start, end, module):
+    ansi = any(tokens[j].text in DIRECTIONS for j in range(start, end))
+    module.ansi = ansi
+    if not ansi:
+        # Non-ANSI: names only, declared in the body
+        for item_start, item_end in split_commas(tokens, start, end):
+            for j in range(item_start, item_end):
+                if tokens[j].kind == lexer.IDENTIFIER:
+                    module.port_order.append(tokens[j].text.lower())
+                    break
+        return
+
+    declarations, header = parse_declarations(tokens, start, end)
+    for declaration in declarations:
+        module.port_order.append(declaration.name)
+        module.ports.setdefault(declaration.name, declaration)
+        module.declarations.append(declaration)
+
+
+def parse_instances(tokens, i, end, module):
+    """
+    'mod #(...) u0 (.a(x), .b(y)), u1 (p, q);' -> one Instance per name,
+    with the port bindings of each.
+    """
+    module_name = tokens[i].text
+    j = i + 1
+    if j < end and tokens[j].text == "#":
+        j += 1
+        if j < end:
+            j = group_end(tokens, j, end) if tokens[j].text == "(" else j + 1
+    for item_start, item_end in split_commas(tokens, j, end):
+        if tokens[item_start].kind != lexer.IDENTIFIER:
+            continue
+        k = item_start + 1
+        while k < item_end and tokens[k].text == "[":  # Instance arrays: u0 [3:0] (...)
+            k = group_end(tokens, k, item_end)
+        connections = []
+        if k < item_end and tokens[k].text == "(":
+            connections = parse_connections(tokens, k + 1, group_end(tokens, k, item_end) - 1)
+        module.instances.append(Instance(module_name, tokens[item_start].text, tokens[item_start].line, connections))
+
+
+def parse_connections(tokens, start, end):
+    connections = []
+    for position, (item_start, item_end) in enumerate(split_commas(tokens, start, end)):
+        if tokens[item_start].text != ".":
+            connections.append((position, tokens[item_start:item_end]))
+            continue
+        if item_start + 1 >= item_end:
+            continue
+        formal = tokens[item_start + 1]
+        if formal.text == "*":
+            connections.append(("*", []))
+        elif item_start + 2 < item_end and tokens[item_start + 2].text == "(":
+            close = group_end(tokens, item_start + 2, item_end)
+            connections.append((formal.text.lower(), tokens[item_start + 3:close - 1]))
+        else:
+            connections.append((formal.text.lower(), [formal]))  # .port, same name in the parent
+    return connections
+
+
+class AstBuilder(Handler):
+    """
+    Builds the SourceAst from the events of engine.walk(), so the AST comes
+    out of the same traversal as the statement facts. Items are taken from
+    the statements at module level; a process (always*, initial, final)
+    runs until the next module item at its begin/end depth, and function,
+    task, class and specify bodies are skipped. Outside modules only
+    packages, imports and typedefs are read. `packages` is the tree-wide
+    PackageIndex (rules.package_index) that imports are resolved in.
+    """
+
+    def __init__(self, packages=None):
+        self.packages = packages
+        self.ast = SourceAst(packages.types if packages is not None else None)
+        self.package = None         # the open Package
+        self.unit_imports = []      # imports at file scope, seen by the modules after them
+        self.module = None
+        self.outer = []             # modules declared around a nested one
+        self.depth = 0              # begin/fork nesting in the module body
+        self.process = None         # the open process Block
+        self.process_depth = 0
+        self.skip_until = None      # end keyword of a skipped body
+        self.sensitive = None       # process Block whose event control may come next
+        self.line = 0               # line of the last event
+
+    def keyword(self, tokens, i):
+        self.sensitive = None
+        text = tokens[i].text
+        self.line = tokens[i].line
+        if text == "endmodule":
+            self.end_module(self.line)
+            return
+        if self.module is None:
+            if text == "endpackage":
+                self.end_package()
+            return
+        if self.skip_until is not None:
+            if text == self.skip_until:
+                self.skip_until = None
+            return
+        if text == "begin" or text == "fork":
+            self.depth += 1
+        elif text == "end" or text.startswith("join"):
+            self.depth -= 1
+            if self.depth < self.process_depth:
+                self.close_process()
+        elif text in PROCESS_KEYWORDS:
+            self.close_process()
+            self.open_process(tokens[i])
+        elif text == "generate" or text == "endgenerate":
+            if self.depth <= self.process_depth:
+                self.close_process()
+
+    def control(self, tokens, i, end):
+        self.sensitive = None
+
+    def timing(self, tokens, i, end):
+        # The event control right after always/initial/final is the sensitivity of that process
+        if self.sensitive is not None and tokens[i].text == "@":
+            self.sensitive.sensitivity = " ".join(t.text for t in tokens[i + 1:end])
+        self.sensitive = None
+
+    def statement(self, tokens, i, op, end):
+        self.sensitive = None
+        token = tokens[i]
+        text = token.text
+        self.line = tokens[end - 1].line
+        if token.kind == lexer.KEYWORD and text in MODULE_KEYWORDS:
+            self.start_module(tokens, i, end)
+            return
+        module = self.module
+        if module is None:
+            self.outer_statement(tokens, i, end)
+            return
+        if self.skip_until is not None:
+            return  # Inside a function, task, class or specify body
+        if self.process is not None:
+            if self.depth > self.process_depth or not self.starts_item(tokens, i, end):
+                return  # a statement of the process
+            self.close_process()
+
+        if text in DIRECTIONS or text in NET_TYPES:
+            declarations, header = parse_declarations(tokens, i, end)
+            for declaration in declarations:
+                if declaration.direction is not None:
+                    module.ports.setdefault(declaration.name, declaration)
+                    if declaration.name not in module.port_order:
+                        module.port_order.append(declaration.name)
+                module.declarations.append(declaration)
+        elif text == "parameter" or text == "localparam":
+            parse_parameters(tokens, i, end, module, text)
+        elif text == "typedef":
+            typedef = parse_typedef(tokens, i, end)
+            if typedef is not None:
+                module.typedefs.append(typedef)
+                module.enums.extend(typedef.constants)
+        elif text == "import":
+            module.imports.extend(parse_import(tokens, i, end))
+        elif text == "assign":
+            module.blocks.append(Block("assign", token.line))
+        elif text in SKIPPED_BLOCKS:
+            self.skip_until = SKIPPED_BLOCKS[text]
+        elif token.kind == lexer.IDENTIFIER and i + 1 < end and tokens[i + 1].text == "#":
+            parse_instances(tokens, i, end, module)
+        elif token.kind == lexer.IDENTIFIER and i + 1 < end and tokens[i + 1].kind == lexer.IDENTIFIER:
+            k = i + 2
+            while k < end and tokens[k].text == "[":
+                k = group_end(tokens, k, end)
+            if k < end and tokens[k].text == "(":
+                parse_instances(tokens, i, end, module)
+            else:
+                # Variable of a user-defined type: state_t state, next_state;
+                declarations, header = parse_declarations(tokens, i, end)
+                module.declarations.extend(declarations)
+        elif token.kind == lexer.IDENTIFIER and op is None and i + 1 < end and tokens[i + 1].text == "[":
+            # Packed array of a user-defined type: word_t [3:0] words;
+            declarations, header = parse_declarations(tokens, i, end)
+            module.declarations.extend(declarations)
+        elif token.kind == lexer.IDENTIFIER and i + 3 < end and tokens[i + 1].text == "::" \
+                and (tokens[i + 3].kind == lexer.IDENTIFIER or tokens[i + 3].text == "["):
+            # Variable of a package type: pkg::key_t key;
+            declarations, header = parse_declarations(tokens, i, end)
+            module.declarations.extend(declarations)
+
+    def outer_statement(self, tokens, i, end):
+        # Outside modules: package headers, package items, imports and typedefs
+        text = tokens[i].text
+        package = self.package
+        if text == "package" and i + 1 < end:
+            self.package = Package(tokens[i + 1].text.lower(), tokens[i].line)
+            self.ast.packages.append(self.package)
+        elif text == "typedef":
+            typedef = parse_typedef(tokens, i, end)
+            if typedef is None:
+                return
+            if package is not None:
+                package.typedefs.append(typedef)
+                package.enums.extend(typedef.constants)
+            else:
+                record = typedef.record(ParamEnv((), import_lookup(self.unit_imports, self.package_value)))
+                self.ast.types.add([record])
+                self.ast.type_records.append((None, record))
+        elif text == "import":
+            (package.imports if package is not None else self.unit_imports).extend(parse_import(tokens, i, end))
+        elif package is not None and (text == "parameter" or text == "localparam"):
+            parse_parameters(tokens, i, end, package, text)
+
+    def end_package(self):
+        package = self.package
+        if package is not None:
+            records = resolve_package(package, self.ast.types, self.package_value)
+            self.ast.type_records.extend((package.name, record) for record in records)
+            self.package = None
+
+    def package_value(self, name, item):
+        # Value of `item` in package `name`: a package of this file first, then the tree's PackageIndex
+        package = self.ast.package(name)
+        if package is not None and package.env is not None:
+            return package.env.lookup(item) if item in package.env else None
+        if self.packages is not None:
+            return self.packages.value(name, item)
+        return None
+
+    def starts_item(self, tokens, i, end):
+        # A declaration, parameter, assign, instance, ... rather than a procedural statement
+        token = tokens[i]
+        if token.text in ITEM_KEYWORDS:
+            return True
+        return token.kind == lexer.IDENTIFIER and i + 1 < end and (
+            tokens[i + 1].text == "#" or tokens[i + 1].kind == lexer.IDENTIFIER)
+
+    def start_module(self, tokens, i, end):
+        # Reads the module header, which walk() hands over as one statement tokens[i:end]
+        j = i + 1
+        while j < end and tokens[j].kind == lexer.KEYWORD:  # module automatic/static
+            j += 1
+        if j >= end:
+            return
+        if self.module is not None:
+            self.outer.append((self.module, self.depth, self.process, self.process_depth))
+        module = Module(tokens[j].text, tokens[i].line)
+        module.imports.extend(self.unit_imports)
+        self.ast.modules.append(module)
+        self.module = module
+        self.depth = 0
+        self.process = None
+        self.process_depth = 0
+        j += 1
+
+        # Package imports in the header
+        while j < end and tokens[j].text == "import":
+            close = find_semicolon(tokens, j, end)
+            module.imports.extend(parse_import(tokens, j, close))
+            j = close + 1
+
+        # Parameter port list: #( ... )
+        if j + 1 < end and tokens[j].text == "#" and tokens[j + 1].text == "(":
+            close = group_end(tokens, j + 1, end)
+            parse_parameters(tokens, j + 2, close - 1, module)
+            j = close
+
+        # Port list: ( ... )
+        if j < end and tokens[j].text == "(":
+            close = group_end(tokens, j, end)
+            parse_port_list(tokens, j + 1, close - 1, module)
+
+    def end_module(self, line):
+        self.close_process()
+        module = self.module
+        if module is None:
+            return
+        resolve_module(module, self.ast.types, self.package_value)
+        module.end_line = line
+        self.skip_until = None
+        if self.outer:
+            self.module, self.depth, self.process, self.process_depth = self.outer.pop()
+        else:
+            self.module = None
+            self.depth = 0
+            self.process_depth = 0
+
+    def open_process(self, token):
+        self.process = Block(token.text, token.line)
+        self.process_depth = self.depth
+        self.module.blocks.append(self.process)
+        self.sensitive = self.process
+
+    def close_process(self):
+        self.process = None
+
+    def finish(self):
+        # Modules still open at the end of the file end at its last statement
+        while self.module is not None:
+            self.end_module(self.line)
+        self.end_package()
+#end of modules
+
+
+def build_ast(tokens, handlers=(), packages=None):
+    """
+    The module AST of a token list or stream. Other handlers, such as the
+    statement facts of the signal table, are fed by the same walk. Imports,
+    package names and types are resolved in the file itself, then in
+    `packages` (a PackageIndex).
+    """
+    builder = AstBuilder(packages)
+    count = walk(tokens, (builder,) + tuple(handlers))
+    builder.finish()
+    builder.ast.token_count = count
+    return builder.ast
+
+
+def get_ast(ctx):
+    # Built once per file and shared by every detector
+    if ctx.ast is None:
+        ctx.ast = build_ast(ctx.iter_tokens(), packages=ctx.packages)
+    return ctx.ast
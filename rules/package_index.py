@@ -0,0 +1,172 @@
+# -----------------------------------------------------------------------------
+# File Name: package_index.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Tree-wide index of SystemVerilog packages (parameters,
+#              localparams, enum constants, imports and typedefs) that the
+#              per-file analysis resolves imports and pkg::NAME references in
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from rules import lexer
+from rules.const_expr import evaluate, expression_text, import_lookup
+from rules.module_ast import get_ast
+from rules.type_index import TypeIndex
+
+
+VALUE_KINDS = ("parameters", "localparams", "enums")
+
+
+class PackageIndex:
+    """
+    Packages of a whole tree, filled with add() from the JSON-ready file
+    summaries of package_summary():
+
+    {"types": [[package or None, typedef record], ...],
+     "packages": [{"package": name, "file": file name,
+                   "parameters": {name: expression}, "localparams": {...},
+                   "enums": {name: expression}, "imports": [[package, name or '*'], ...]}, ...]}
+
+    Values are kept as expression text and evaluated on first use, after
+    the names they refer to in the same or an imported package, so
+    packages may build on each other across files; every value is then a
+    dict hit. `types` is the TypeIndex of every typedef outside a module.
+    When a package is defined twice the first definition is used.
+    """
+
+    def __init__(self):
+        self.packages = {}
+        self.types = TypeIndex(values=self.scope_value)
+        self._values = {}
+        self._pending = set()
+
+    def add(self, summary):
+        for package in summary["packages"]:
+            self.packages.setdefault(package["package"], package)
+        for scope, record in summary["types"]:
+            self.types.add([record], scope)
+        self._values.clear()
+
+    def __contains__(self, package):
+        return package in self.packages
+
+    def __len__(self):
+        return len(self.packages) + len(self.types)
+
+    def value(self, package, name):
+        # Value of NAME in `package` (lowercase), None when unknown or not constant
+        key = (package, name)
+        if key in self._values:
+            return self._values[key]
+        entry = self.packages.get(package)
+        if entry is None or key in self._pending:
+            return None
+        text = None
+        for kind in VALUE_KINDS:
+            text = entry[kind].get(name)
+            if text is not None:
+                break
+        if text is None:
+            return None  # Imported names are not exported
+        self._pending.add(key)
+        value = evaluate(lexer.tokenize(text), lambda item: self.scope_value(package, item))
+        self._pending.discard(key)
+        self._values[key] = value
+        return value
+
+    def scope_value(self, package, name):
+        # A name as written inside `package` (None for file scope): its own, imported, or pkg::NAME
+        if package is not None and self.declares(package, name):
+            return self.value(package, name)
+        entry = self.packages.get(package)
+        return import_lookup(entry["imports"] if entry is not None else (), self.value)(name)
+
+    def declares(self, package, name):
+        entry = self.packages.get(package)
+        return entry is not None and any(name in entry[kind] for kind in VALUE_KINDS)
+
+    def unchanged(self, uses):
+        """
+        True when every lookup of `uses` (PackageUses.record() of a file)
+        still gives the recorded result, so the cached rows of that file
+        are still valid after the packages of the tree changed.
+        """
+        if uses is None:
+            return False
+        return all(self.value(package, name) == value for package, name, value in uses["values"]) and \
+            all(self.types.width(name) == width for name, width in uses["widths"]) and \
+            all((name in self.types) == known for name, known in uses["types"])
+
+
+class PackageUses:
+    """
+    Stands in for a PackageIndex while one file is analyzed and records
+    every value and type the file looks up in it, with the result. A file
+    whose lookups give the same results in a later index (see
+    PackageIndex.unchanged) needs no new analysis, so a package edit only
+    reaches the files that use what changed.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.types = _TypeUses(index.types)
+        self.values = {}
+
+    def value(self, package, name):
+        value = self.index.value(package, name)
+        self.values[(package, name)] = value
+        return value
+
+    def record(self):
+        # JSON-ready lookups for the result cache
+        return {
+            "values": [[package, name, value] for (package, name), value in self.values.items()],
+            "widths": [[name, width] for name, width in self.types.widths.items()],
+            "types": [[name, known] for name, known in self.types.known.items()],
+        }
+
+
+class _TypeUses:
+    # The outer TypeIndex of a file's types, recording the names asked for
+
+    def __init__(self, types):
+        self.types = types
+        self.widths = {}
+        self.known = {}
+
+    def __contains__(self, name):
+        known = name in self.types
+        self.known[name] = known
+        return known
+
+    def width(self, name):
+        width = self.types.width(name)
+        self.widths[name] = width
+        return width
+
+
+def package_summary(ctx):
+    """
+    What the PackageIndex needs from one file (see PackageIndex), small and
+    JSON-ready so it can come back from a worker process and go into the
+    result cache.
+    """
+    ast = get_ast(ctx)
+    packages = []
+    for package in ast.packages:
+        values = {"parameters": {}, "localparams": {}}
+        for param in package.parameters:
+            values[param.kind + "s"].setdefault(param.name, expression_text(param.value))
+        packages.append({
+            "package": package.name,
+            "file": ctx.file_name,
+            "parameters": values["parameters"],
+            "localparams": values["localparams"],
+            "enums": {enum.name: expression_text(enum.value) for enum in package.enums},
+            "imports": [list(item) for item in package.imports],
+        })
+    return {"types": [[scope, record] for scope, record in ast.type_records], "packages": packages}
@@ -0,0 +1,51 @@
+# -----------------------------------------------------------------------------
+# File Name: parse_context.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Reads an individual Verilog/SystemVerilog file once and keeps
+#              the normalized views of it that every detector works on
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from rules import lexer
+from rules.reader import SourceFile
+from rules.preprocessor import shared_preprocessor
+
+
+class ParseContext:
+    """
+    Per-file parse context shared by all detectors.
+
+    The file is memory-mapped once and handed to every extractor instead of
+    a file path. The detectors only work on the token stream of
+    iter_tokens(), so the text of a large file is never decoded as a whole,
+    split into lines or held as one token list:
+
+    source       -- the mapped file (rules.reader.SourceFile)
+    size         -- bytes on disk
+    ast          -- module AST built from the tokens (rules.module_ast.get_ast)
+    packages     -- tree-wide PackageIndex that imports and types are resolved in, if any
+    """
+
+    def __init__(self, file_path, file_name=None, preprocessor=None, packages=None):
+        self.file_path = file_path
+        self.file_name = file_name if file_name is not None else file_path
+        self.preprocessor = preprocessor if preprocessor is not None else shared_preprocessor()
+        self.packages = packages
+        self.source = SourceFile(file_path)
+        self.size = self.source.size
+        self.ast = None  # Filled by rules.module_ast.get_ast
+        self.signal_table = None  # Filled by rules.signal_table.get_signal_table
+
+    def iter_tokens(self):
+        # Lexer tokens of the mapped bytes, without comments, with `include/`define/`ifdef applied
+        # by `preprocessor`; produced as they are walked, afresh on every call
+        return self.preprocessor.preprocess(self.file_path, lexer.iter_tokens(self.source.data))
+
+    def close(self):
+        # Unmaps the file; the AST and signal table built from it stay usable
+        self.source.close()
@@ -0,0 +1,515 @@
+# -----------------------------------------------------------------------------
+# File Name: preprocessor.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Verilog preprocessor over the lexer tokens: `include through
+#              search paths, `define/`undef macros with arguments, and
+#              `ifdef/`ifndef/`elsif/`else/`endif, with included headers cached
+#              per (file, define set) and an include-dependency graph
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import os
+import re
+import hashlib
+from itertools import islice
+
+from rules import lexer
+from rules.engine import OPEN_BRACKETS, CLOSE_BRACKETS, group_end
+from rules.module_ast import split_commas
+
+
+CONDITIONALS = frozenset(["`ifdef", "`ifndef", "`elsif", "`else", "`endif"])
+# Directives that only matter to a simulator; they are dropped with the rest of their line
+DROPPED_DIRECTIVES = frozenset([
+    "`timescale", "`default_nettype", "`line", "`pragma", "`begin_keywords", "`end_keywords",
+    "`resetall", "`celldefine", "`endcelldefine", "`unconnected_drive", "`nounconnected_drive",
+])
+MAX_DEPTH = 32  # Nested includes, and macros expanding macros
+CHUNK = 4096    # Tokens of a file expanded at a time (see line_chunks)
+PASTE = object()  # `` in a macro body while its arguments are substituted
+_INCLUDE = re.compile(rb'^[ \t]*`include[ \t]*["<]([^">\r\n]+)[">]', re.MULTILINE)
+# Words of the files the package pre-pass parses, looked for in the same read as the includes
+PACKAGE_MARKERS = (b"package", b"typedef")
+
+_shared = {}
+
+
+class Macro:
+    __slots__ = ("params", "defaults", "body", "key")
+
+    def __init__(self, params, defaults, body):
+        self.params = params      # None for an object-like macro
+        self.defaults = defaults  # param -> default tokens
+        self.body = body          # tokens
+        self.key = (tuple(params) if params is not None else None,
+                    tuple((name, tuple(t.text for t in tokens)) for name, tokens in defaults.items()),
+                    tuple((t.kind, t.text) for t in body))
+
+
+class Header:
+    """
+    An included file as expanded for one set of macros: its tokens, the
+    macros it defines (None for an `undef) and the (mtime, size) of every
+    file it was read from, which must be unchanged for the entry to be used.
+    """
+    __slots__ = ("tokens", "changes", "files")
+
+    def __init__(self, tokens, changes, files):
+        self.tokens = tokens
+        self.changes = changes
+        self.files = files
+
+
+class Conditions:
+    # `ifdef nesting of a file, kept from one chunk of it to the next
+    __slots__ = ("active", "stack")
+
+    def __init__(self):
+        self.active = True
+        self.stack = []  # [active around the `ifdef, a branch was taken]
+
+
+def file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def macro_tokens(text, line=0):
+    # Tokens of a -D value, or of the empty body of '-D NAME'
+    return [lexer.Token(t.kind, t.text, line, t.col) for t in lexer.tokenize(text)]
+
+
+class Preprocessor:
+    """
+    Expands the directives of a token stream (see preprocess()). One instance
+    is kept per process and configuration (shared_preprocessor), so a header
+    included by many files is read and expanded once per define set for the
+    whole run, also in the worker processes of --jobs.
+
+    include_dirs -- searched, in order, after the directory of the file
+    defines      -- name -> value text, like -D name=value
+    graph        -- path -> paths it includes, filled by include_closure()
+
+    Each file is read once while it is unchanged (scan_file) for its
+    includes, its content digest and its package markers.
+    """
+
+    def __init__(self, include_dirs=(), defines=None):
+        self.include_dirs = [os.path.abspath(d) for d in include_dirs]
+        self.defines = dict(defines or {})
+        self.base_macros = {name: Macro(None, {}, macro_tokens(value)) for name, value in self.defines.items()}
+        self.graph = {}
+        self._stamps = {}    # path -> stamp the graph, digest and marker entries were read at
+        self._digests = {}   # path -> sha256 of the content
+        self._markers = {}   # path -> True when it has a PACKAGE_MARKERS word
+        self._lexed = {}     # path -> (stamp, tokens)
+        self._headers = {}   # (path, macros fingerprint) -> Header
+        self.header_hits = 0
+        self.header_misses = 0
+
+    def __reduce__(self):
+        # Pickled as its configuration: a worker gets its own shared instance
+        return shared_preprocessor, (tuple(self.include_dirs), tuple(sorted(self.defines.items())))
+
+    @property
+    def configured(self):
+        return bool(self.include_dirs or self.defines)
+
+    #Start of include resolution
+    def resolve(self, name, including_file):
+        # Path of `include "name": next to the including file, then the include dirs
+        if os.path.isabs(name):
+            return name if os.path.isfile(name) else None
+        for directory in [os.path.dirname(os.path.abspath(including_file))] + self.include_dirs:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                return os.path.normpath(path)
+        return None
+
+    def scan_file(self, path):
+        """
+        Reads a file (absolute path) unless it is unchanged since the last
+        read: the resolved paths of its `include lines go into `graph`
+        (found with a byte regex without lexing it, so includes inside
+        `ifdef branches are listed too), with its content digest and
+        whether it has a package marker.
+        """
+        stamp = file_stamp(path)
+        if self._stamps.get(path) == stamp and path in self.graph:
+            return
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        names = [match.group(1).decode("utf-8", "ignore").strip() for match in _INCLUDE.finditer(data)]
+        resolved = (self.resolve(name, path) for name in names)
+        self.graph[path] = [p for p in dict.fromkeys(resolved) if p is not None]
+        self._digests[path] = hashlib.sha256(data).digest()
+        self._markers[path] = any(marker in data for marker in PACKAGE_MARKERS)
+        self._stamps[path] = stamp
+
+    def includes(self, path):
+        # Resolved paths of the `include lines of a file, kept in `graph` until the file changes
+        self.scan_file(path)
+        return self.graph[path]
+
+    def include_closure(self, path):
+        # Every file reached through the includes of `path`, not counting itself
+        seen = set()
+        stack = list(self.includes(path))
+        while stack:
+            header = stack.pop()
+            if header in seen or header == path:
+                continue
+            seen.add(header)
+            stack.extend(self.includes(header))
+        return sorted(seen)
+
+    def includers(self, path):
+        # Files of the graph that include `path` directly
+        return [source for source, headers in self.graph.items() if path in headers]
+
+    def dependency_key(self, path):
+        """
+        Part of the result cache key of a file: the configuration and the
+        content of every header it includes. Empty for a file without
+        includes and no -I/-D, so such keys are the same as without a
+        preprocessor.
+        """
+        closure = self.include_closure(os.path.abspath(path))
+        if not closure and not self.configured:
+            return ""
+        digest = hashlib.sha256()
+        digest.update(repr((self.include_dirs, sorted(self.defines.items()))).encode())
+        for header in closure:
+            digest.update(header.encode())
+            digest.update(self.content_digest(header))
+        return digest.hexdigest()[:16]
+
+    def content_digest(self, path):
+        # sha256 of a file (absolute path), from the same read as its includes
+        self.scan_file(path)
+        return self._digests[path]
+
+    def declares_packages(self, path):
+        # True when a file (absolute path) or a header it includes has a package or typedef
+        return any(self._markers[p] for p in [path] + self.include_closure(path))
+    #end of include resolution
+
+    def lex(self, path):
+        # Tokens of a header, lexed once while the file is unchanged
+        stamp = file_stamp(path)
+        known = self._lexed.get(path)
+        if known is None or known[0] != stamp:
+            with open(path, "rb") as f:
+                known = (stamp, lexer.tokenize(f.read()))
+            self._lexed[path] = known
+        return known[1]
+
+    def preprocess(self, file_path, tokens):
+        """
+        `tokens` (a list or any iterable) of `file_path` with the directives
+        applied: included files spliced in, macros expanded (with the line
+        of their use), inactive `ifdef branches removed and simulator-only
+        directives dropped. The tokens come out as they are expanded, one
+        chunk of lines (line_chunks) at a time.
+        """
+        macros = dict(self.base_macros)
+        path = os.path.abspath(file_path)
+        conditions = Conditions()
+        for chunk in line_chunks(tokens):
+            yield from self.run(path, chunk, macros, (path,), {}, conditions)
+
+    #Start of expansion
+    def run(self, path, tokens, macros, stack, files, state=None):
+        # The tokens of a whole header, or of one chunk of a file with the `ifdef `state` it left
+        if state is None:
+            state = Conditions()
+        out = []
+        n = len(tokens)
+        active = state.active
+        conditions = state.stack
+        i = 0
+        positions = [k for k, token in enumerate(tokens) if token.kind == lexer.DIRECTIVE]
+        if not positions:
+            return tokens if active else out
+        for position in positions:
+            if position < i:
+                continue  # Consumed by a `define body or macro arguments
+            if active:
+                out.extend(tokens[i:position])
+            token = tokens[position]
+            text = token.text
+            i = position + 1
+
+            if text in CONDITIONALS:
+                name = tokens[i].text if i < n and tokens[i].line == token.line else ""
+                if text == "`ifdef" or text == "`ifndef":
+                    taken = active and ((name in macros) == (text == "`ifdef"))
+                    conditions.append([active, taken])
+                    active = taken
+                    i += 1
+                elif not conditions:
+                    pass  # Unbalanced `elsif/`else/`endif
+                elif text == "`elsif":
+                    outer, done = conditions[-1]
+                    active = outer and not done and name in macros
+                    conditions[-1][1] = done or active
+                    i += 1
+                elif text == "`else":
+                    outer, done = conditions[-1]
+                    active = outer and not done
+                    conditions[-1][1] = True
+                else:
+                    active = conditions.pop()[0]
+                continue
+            if not active:
+                continue
+
+            if text == "`define":
+                i = self.define(tokens, position, macros)
+            elif text == "`undef":
+                if i < n:
+                    macros.pop(tokens[i].text, None)
+                    i += 1
+            elif text == "`include":
+                i = self.include(tokens, position, path, macros, stack, files, out)
+            elif text in DROPPED_DIRECTIVES:
+                while i < n and tokens[i].line == token.line:
+                    i += 1
+            elif text[1:] in macros:
+                i = self.expand(tokens, position, macros, out, 0)
+            else:
+                out.append(token)  # Undefined macro, left for the parser to skip
+        if active:
+            out.extend(tokens[i:])
+        state.active = active
+        return out
+
+    def define(self, tokens, i, macros):
+        # Reads '`define NAME(a, b = 1) body \' and returns the index past it
+        n = len(tokens)
+        line = tokens[i].line
+        j = i + 1
+        if j >= n or tokens[j].line != line:
+            return j
+        name_token = tokens[j]
+        j += 1
+        params = None
+        defaults = {}
+        if j < n and tokens[j].text == "(" and tokens[j].line == line \
+                and tokens[j].col == name_token.col + len(name_token.text):
+            close = group_end(tokens, j, n)
+            params = []
+            for start, end in split_commas(tokens, j + 1, close - 1):
+                params.append(tokens[start].text)
+                if start + 1 < end and tokens[start + 1].text == "=":
+                    defaults[tokens[start].text] = tokens[start + 2:end]
+            j = close
+        body = []
+        while j < n and tokens[j].line == line:
+            token = tokens[j]
+            j += 1
+            if token.kind == lexer.UNKNOWN and token.text == "\\" and (j >= n or tokens[j].line != line):
+                line += 1  # Continued on the next line
+                continue
+            body.append(token)
+        macros[name_token.text] = Macro(params, defaults, body)
+        return j
+
+    def include(self, tokens, i, path, macros, stack, files, out):
+        # Splices the expanded tokens of '`include "file"' into `out`
+        n = len(tokens)
+        line = tokens[i].line
+        j = i + 1
+        name = None
+        if j < n and tokens[j].kind == lexer.STRING:
+            name = tokens[j].text.strip('"')
+            j += 1
+        elif j < n and tokens[j].text == "<":
+            k = j + 1
+            while k < n and tokens[k].text != ">" and tokens[k].line == line:
+                k += 1
+            name = "".join(t.text for t in tokens[j + 1:k])
+            j = k + 1
+        if name is None:
+            return j
+        header = self.resolve(name, path)
+        if header is None or header in stack or len(stack) > MAX_DEPTH:
+            return j  # Not found, or an include cycle
+
+        key = (header, frozenset((macro_name, macro.key) for macro_name, macro in macros.items()))
+        entry = self._headers.get(key)
+        if entry is not None and all(file_stamp(p) == stamp for p, stamp in entry.files.items()):
+            self.header_hits += 1
+            for macro_name, macro in entry.changes.items():
+                if macro is None:
+                    macros.pop(macro_name, None)
+                else:
+                    macros[macro_name] = macro
+        else:
+            self.header_misses += 1
+            before = dict(macros)
+            header_files = {header: file_stamp(header)}
+            expanded = self.run(header, self.lex(header), macros, stack + (header,), header_files)
+            changes = {macro_name: macros.get(macro_name) for macro_name in set(before) | set(macros)
+                       if before.get(macro_name) is not macros.get(macro_name)}
+            entry = Header(expanded, changes, header_files)
+            self._headers[key] = entry
+        files.update(entry.files)
+        out.extend(entry.tokens)
+        return j
+
+    def expand(self, tokens, i, macros, out, depth):
+        # Appends the expansion of the macro used at tokens[i] and returns the index past its arguments
+        n = len(tokens)
+        use = tokens[i]
+        macro = macros[use.text[1:]]
+        j = i + 1
+        body = macro.body
+        if macro.params is not None:
+            args = []
+            if j < n and tokens[j].text == "(":
+                close = group_end(tokens, j, n)
+                args = [tokens[start:end] for start, end in split_commas(tokens, j + 1, close - 1)]
+                j = close
+            body = substitute(macro, args)
+        if depth < MAX_DEPTH:
+            body = self.expand_all(body, macros, depth + 1)
+        out.extend(lexer.Token(t.kind, t.text, use.line, use.col) for t in body)
+        return j
+
+    def expand_all(self, tokens, macros, depth):
+        # Macros used inside a macro body or argument
+        if not any(t.kind == lexer.DIRECTIVE for t in tokens):
+            return tokens
+        out = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token.kind == lexer.DIRECTIVE and token.text[1:] in macros:
+                i = self.expand(tokens, i, macros, out, depth)
+            else:
+                out.append(token)
+                i += 1
+        return out
+    #end of expansion
+
+
+def line_chunks(tokens, size=CHUNK):
+    """
+    Cuts a token stream into lists of at least `size` tokens (the last one
+    may be shorter) that each end with a whole line outside any brackets, so
+    a directive line, a `define continued with '\\' and the arguments of a
+    macro use are never split between two chunks.
+    """
+    tokens = iter(tokens)
+    chunk = list(islice(tokens, size))
+    while chunk:
+        depth = bracket_depth(chunk)
+        last = chunk[-1]
+        for token in tokens:
+            if depth == 0 and token.line != last.line and last.kind != lexer.DIRECTIVE and last.text != "\\":
+                break
+            chunk.append(token)
+            depth = bracket_depth((token,), depth)
+            last = token
+        else:
+            yield chunk
+            return
+        yield chunk
+        chunk = [token]
+        chunk.extend(islice(tokens, size - 1))
+
+
+def bracket_depth(tokens, depth=0):
+    # Brackets left open after `tokens`; a stray closing bracket is ignored
+    for token in tokens:
+        if token.kind == lexer.PUNCT:
+            if token.text in OPEN_BRACKETS:
+                depth += 1
+            elif token.text in CLOSE_BRACKETS and depth:
+                depth -= 1
+    return depth
+
+
+def substitute(macro, args):
+    # The body of a macro with arguments, params replaced and `` pasted
+    values = {}
+    for k, param in enumerate(macro.params):
+        if k < len(args) and args[k]:
+            values[param] = args[k]
+        else:
+            values[param] = macro.defaults.get(param, [])
+
+    # a``b is lexed as 'a' '`' '`b' (or '`' '`' 'b' before a non-word character). The paste is read
+    # first, as PASTE and the name 'b', so a param is replaced on either side of it
+    body = []
+    source = macro.body
+    k = 0
+    while k < len(source):
+        token = source[k]
+        if token.text == "`" and k + 1 < len(source):
+            right = source[k + 1]
+            if right.kind == lexer.DIRECTIVE:
+                body.append(PASTE)
+                body.append(lexer.Token(lexer.IDENTIFIER, right.text[1:], right.line, right.col + 1))
+                k += 2
+                continue
+            if right.text == "`":
+                body.append(PASTE)
+                k += 2
+                continue
+        body.append(token)
+        k += 1
+
+    expanded = []
+    for token in body:
+        if token is not PASTE and token.kind == lexer.IDENTIFIER and token.text in values:
+            expanded.extend(values[token.text])
+        else:
+            expanded.append(token)
+
+    pasted = []
+    k = 0
+    while k < len(expanded):
+        token = expanded[k]
+        k += 1
+        if token is not PASTE:
+            pasted.append(token)
+        elif pasted and k < len(expanded) and expanded[k] is not PASTE:
+            left = pasted.pop()
+            pasted.append(lexer.Token(lexer.IDENTIFIER, left.text + expanded[k].text, left.line, left.col))
+            k += 1
+    return pasted
+
+
+def shared_preprocessor(include_dirs=(), defines=()):
+    """
+    The Preprocessor of this process for a configuration, so the header
+    cache lasts the whole run. `defines` is a mapping or (name, value) pairs.
+    """
+    defines = dict(defines)
+    key = (tuple(os.path.abspath(d) for d in include_dirs), tuple(sorted(defines.items())))
+    preprocessor = _shared.get(key)
+    if preprocessor is None:
+        preprocessor = _shared[key] = Preprocessor(include_dirs, defines)
+    return preprocessor
+
+
+def parse_define(text):
+    # '-D NAME=VALUE' -> (NAME, VALUE); '-D NAME' defines it empty
+    name, _, value = text.partition("=")
+    name = name.strip()
+    if not name.isidentifier():
+        raise ValueError(f"invalid macro name in '{text}'")
+    return name, value
@@ -0,0 +1,145 @@
+# -----------------------------------------------------------------------------
+# File Name: profiling.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Opt-in timing of every stage of a scan (per file, detector and
+#              extraction), summarized as a table or saved as a Chrome trace
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import os
+import json
+import time
+import threading
+
+
+class Profiler:
+    """
+    Collects one event per timed span: name, category, start and duration
+    in microseconds, the process id and free-form args (file name, bytes
+    read, match counts). Events of worker processes are merged in with
+    merge(); perf_counter is system-wide, so their timestamps line up.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def add(self, name, category, start, end, args):
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+    def merge(self, events):
+        self.events.extend(events)
+
+    def write_trace(self, trace_file):
+        # Loads in chrome://tracing and https://ui.perfetto.dev
+        with open(trace_file, 'w') as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self, slowest=5):
+        """
+        Text table of the total time, calls, matches and bytes of every
+        stage, followed by the slowest files.
+        """
+        stages = {}
+        files = []
+        for event in self.events:
+            if event["cat"] == "file":
+                files.append(event)
+                continue
+            stage = stages.setdefault((event["cat"], event["name"]), [0, 0.0, 0.0, 0, 0])
+            stage[0] += 1
+            stage[1] += event["dur"]
+            stage[2] = max(stage[2], event["dur"])
+            stage[3] += event["args"].get("matches", 0)
+            stage[4] += event["args"].get("bytes", 0)
+
+        lines = [f"{'stage':<48}{'calls':>8}{'total ms':>12}{'max ms':>10}{'matches':>10}{'bytes':>12}"]
+        for (category, name), (calls, total, longest, matches, size) in sorted(
+                stages.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(f"{category + ':' + name:<48}{calls:>8}{total / 1e3:>12.2f}"
+                         f"{longest / 1e3:>10.2f}{matches:>10}{size:>12}")
+
+        if files:
+            files.sort(key=lambda event: event["dur"], reverse=True)
+            lines.append("")
+            lines.append(f"{'slowest files':<60}{'ms':>10}{'bytes':>12}")
+            for event in files[:slowest]:
+                lines.append(f"{event['args'].get('path', event['name'])[-60:]:<60}"
+                             f"{event['dur'] / 1e3:>10.2f}{event['args'].get('bytes', 0):>12}")
+        return "\n".join(lines)
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "category", "args", "start")
+
+    def __init__(self, profiler, name, category, args):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.args
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.category, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class _NoSpan:
+    # Used while profiling is off: no clock reads, nothing recorded
+    __slots__ = ()
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+_profiler = None
+
+
+def enable():
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable():
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def enabled():
+    return _profiler is not None
+
+
+def current():
+    return _profiler
+
+
+def span(name, category, **args):
+    """
+    Times the body of a with-block. The block gets the args dict and may add
+    counts to it, e.g. `event["matches"] = len(found)`.
+    """
+    if _profiler is None:
+        return _NO_SPAN
+    return _Span(_profiler, name, category, args)
@@ -0,0 +1,38 @@
+# -----------------------------------------------------------------------------
+# File Name: reader.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Memory-mapped access to RTL files, so large generated files are
+#              scanned in place by the lexer's byte-level regex
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import os
+import mmap
+
+
+class SourceFile:
+    """
+    Read-only bytes of one RTL file.
+
+    `data` is an mmap of the file (b"" for an empty file): the OS pages it
+    in while the lexer scans it, and it is never copied into a Python
+    string or split into lines.
+    """
+
+    def __init__(self, file_path):
+        with open(file_path, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            if self.size:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = b""  # mmap cannot map an empty file
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = b""
@@ -0,0 +1,171 @@
+# -----------------------------------------------------------------------------
+# File Name: result_cache.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: On-disk cache of detector rows per RTL file, keyed by the file
+#              content and the version of the rules, so a rescan of a large
+#              IP tree only re-analyzes the files that changed
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+from pathlib import Path
+
+
+CACHE_DIR_NAME = ".asset_cache"
+CACHE_DB_NAME = "results.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # Stored rows, not counting SQLite overhead
+RESULTS = "results"  # Detector rows of a file
+MODULES = "modules"  # Module summaries of a file, for --hierarchy
+PACKAGES = "packages"  # Package summaries of a file, for the package index
+USES = "uses"  # Package values and types a file looked up, which its rows are valid for
+TABLES = (RESULTS, MODULES, PACKAGES, USES)
+
+_rule_version = None
+
+
+def rule_version():
+    """
+    Hash of every rule module source and built-in rules file. Any edit to a
+    detector changes the version, so rows computed by older rules are never
+    served.
+    """
+    global _rule_version
+    if _rule_version is None:
+        digest = hashlib.sha256()
+        rules_dir = Path(__file__).resolve().parent
+        for source in sorted(list(rules_dir.glob("*.py")) + list(rules_dir.glob("*.toml"))):
+            digest.update(source.name.encode())
+            digest.update(source.read_bytes())
+        _rule_version = digest.hexdigest()[:16]
+    return _rule_version
+
+
+def file_key(file_name, content_digest, rule_set="", depends=""):
+    # content_digest is the sha256 of the file (Preprocessor.content_digest, from the
+    # one read that also finds its includes). The file name is part of every row, so it
+    # is part of the key as well; rule_set is the fingerprint of the classification
+    # rules in use and depends that of the headers the file includes
+    # (Preprocessor.dependency_key)
+    digest = hashlib.sha256()
+    digest.update(file_name.encode('utf-8', errors='ignore'))
+    digest.update(b"\0")
+    digest.update(content_digest)
+    key = digest.hexdigest() + ":" + rule_version()
+    for part in (rule_set, depends):
+        if part:
+            key += ":" + part
+    return key
+
+
+class ResultCache:
+    """
+    SQLite store of detector rows under `cache_dir`, with the module
+    summaries of --hierarchy, the package summaries of the package index
+    and the package lookups of every file in tables of their own.
+
+    Only the process that owns the cache reads and writes it; worker
+    processes just run the detectors. Entries are evicted least recently
+    used first once the stored rows exceed `max_bytes`.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.cache_dir / CACHE_DB_NAME))
+        with self.conn:
+            for table in TABLES:
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    " key TEXT PRIMARY KEY,"
+                    " rows TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " last_used REAL NOT NULL)"
+                )
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_used ON {table} (last_used)")
+
+    def get_many(self, keys, table=RESULTS):
+        """
+        Returns key -> rows for the keys found in the cache and marks them as
+        used. Missing keys are left out. Hits and misses are counted for the
+        detector rows only.
+        """
+        found = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500):  # Stay under SQLite's variable limit
+            batch = keys[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            for key, rows in self.conn.execute(
+                    f"SELECT key, rows FROM {table} WHERE key IN ({marks})", batch):
+                found[key] = json.loads(rows)
+        if found:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(f"UPDATE {table} SET last_used = ? WHERE key = ?",
+                                      [(now, key) for key in found])
+        if table == RESULTS:
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def stale(self, count):
+        # Rows that were found but are no longer valid (a package lookup changed) count as misses
+        self.hits -= count
+        self.misses += count
+
+    def put_many(self, items, table=RESULTS):
+        # items: (key, rows) pairs
+        now = time.time()
+        records = []
+        for key, rows in items:
+            text = json.dumps(rows)
+            records.append((key, text, len(text), now))
+        if not records:
+            return
+        with self.conn:
+            self.conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?)", records)
+        self.evict()
+
+    def evict(self):
+        # max_bytes covers every table; the least recently used entries go first, whichever table
+        total = sum(self.conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+                    for table in TABLES)
+        if total <= self.max_bytes:
+            return
+        entries = " UNION ALL ".join(f"SELECT '{table}', key, size, last_used FROM {table}" for table in TABLES)
+        stale = {table: [] for table in TABLES}
+        for table, key, size, last_used in self.conn.execute(entries + " ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            stale[table].append((key,))
+            total -= size
+        with self.conn:
+            for table, keys in stale.items():
+                self.conn.executemany(f"DELETE FROM {table} WHERE key = ?", keys)
+
+    def close(self):
+        self.conn.close()
+
+
+def clear_cache(cache_dir):
+    cache_dir = Path(cache_dir)
+    if cache_dir.is_dir():
+        shutil.rmtree(cache_dir)
+
+
+def default_cache_dir(path):
+    directory = Path(path) if os.path.isdir(path) else Path(path).parent
+    return directory / CACHE_DIR_NAME
@@ -0,0 +1,291 @@
+# -----------------------------------------------------------------------------
+# File Name: rule_registry.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Declarative classification rules (a predicate over the signal
+#              table plus a signal type and CIA tag), loaded from TOML or YAML
+#              and evaluated together in one pass over the per-file table
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import re
+import json
+import hashlib
+from pathlib import Path
+
+
+DEFAULT_RULES_FILE = Path(__file__).resolve().parent / "default_rules.toml"
+
+# Candidate names of a rule, one column of the signal table each
+SOURCES = {
+    "if_else": lambda table: sorted(set(table.if_else)),
+    "case": lambda table: sorted(set(table.cases)),
+    "input": lambda table: table.inputs,
+    "output": lambda table: table.outputs,
+    "param_bit": lambda table: table.param_bits,
+    "parameter": lambda table: table.parameters,
+}
+# Width tables: widths of literal ranges only, or with parameter ranges resolved
+WIDTHS = {
+    "literal": lambda table: table.widths,
+    "resolved": lambda table: table.param_widths,
+}
+CIA_LETTERS = frozenset("CIA")
+# One line of the TOML subset read without a TOML parser: a [[table]] header or a
+# key = "string" / integer / boolean pair, either with an optional comment
+TOML_LINE = re.compile(r"""\s*(?:\[\[\s*(?P<table>[\w-]+)\s*\]\]|(?P<key>[\w-]+)\s*=\s*"""
+                       r"""(?P<value>"(?:[^"\\]|\\.)*"|[+-]?\d[\d_]*|true|false))?\s*(?:#.*)?""")
+
+_default_rules = None
+
+
+class Rule:
+    """
+    One classification. A candidate from `source` becomes the row
+    [name, width, signal_type, appeared_in, file name, cia] when:
+
+    trace_drivers          -- the candidate is an input; any other candidate
+                              is replaced by the input on the rhs of its first
+                              blocking and non-blocking assignment
+    assigned               -- the candidate is the lhs of an assignment
+    min_width, max_width   -- its width (0 when undeclared) is in range
+    require_port           -- it is in a module port list, (only up to
+    require_port_max_width    require_port_max_width bits when set)
+
+    width_label replaces the width in the row ("1-bit" for parameters).
+    """
+
+    FIELDS = {
+        "name": str,
+        "signal_type": str,
+        "cia": str,
+        "source": str,
+        "appeared_in": str,
+        "trace_drivers": bool,
+        "assigned": bool,
+        "widths": str,
+        "min_width": int,
+        "max_width": int,
+        "require_port": bool,
+        "require_port_max_width": int,
+        "width_label": str,
+        "enabled": bool,
+    }
+    REQUIRED = ("name", "signal_type", "cia", "source")
+
+    __slots__ = tuple(FIELDS)
+
+    def __init__(self, name, signal_type, cia, source, appeared_in=None, trace_drivers=False,
+                 assigned=False, widths="literal", min_width=None, max_width=None, require_port=False,
+                 require_port_max_width=None, width_label=None, enabled=True):
+        self.name = name
+        self.signal_type = signal_type
+        self.cia = cia
+        self.source = source
+        self.appeared_in = appeared_in if appeared_in is not None else source
+        self.trace_drivers = trace_drivers
+        self.assigned = assigned
+        self.widths = widths
+        self.min_width = min_width
+        self.max_width = max_width
+        self.require_port = require_port
+        self.require_port_max_width = require_port_max_width
+        self.width_label = width_label
+        self.enabled = enabled
+
+    @classmethod
+    def from_dict(cls, fields, origin="rule"):
+        # A rule table of a rules file, checked field by field
+        name = fields.get("name", "?")
+        for key in cls.REQUIRED:
+            if key not in fields:
+                raise ValueError(f"{origin}: rule '{name}' has no '{key}'")
+        for key, value in fields.items():
+            if key not in cls.FIELDS:
+                raise ValueError(f"{origin}: rule '{name}' has an unknown field '{key}'")
+            expected = cls.FIELDS[key]
+            if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                raise ValueError(f"{origin}: '{key}' of rule '{name}' must be a {expected.__name__}")
+        if fields["source"] not in SOURCES:
+            raise ValueError(f"{origin}: unknown source '{fields['source']}' in rule '{name}' "
+                             f"(one of {', '.join(SOURCES)})")
+        if fields.get("widths", "literal") not in WIDTHS:
+            raise ValueError(f"{origin}: unknown widths '{fields['widths']}' in rule '{name}' "
+                             f"(one of {', '.join(WIDTHS)})")
+        if not set(fields["cia"]) <= CIA_LETTERS:
+            raise ValueError(f"{origin}: cia of rule '{name}' may only use the letters C, I and A")
+        return cls(**fields)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def width_ok(self, width):
+        return (self.min_width is None or width >= self.min_width) and \
+               (self.max_width is None or width <= self.max_width)
+
+    def __repr__(self):
+        return f"Rule({self.name}: {self.signal_type} from {self.source})"
+
+
+#Start of loading
+def toml_parser():
+    # tomllib (Python 3.11+) or the tomli package it came from; None when neither is there
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return None
+    return tomllib
+
+
+def read_toml_subset(path):
+    """
+    The document of a TOML file that only uses [[table]] headers, comments
+    and key = "string" / integer / boolean pairs, as default_rules.toml
+    does. Used when no TOML parser is installed; other TOML is refused.
+    """
+    document = {}
+    table = document
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            match = TOML_LINE.fullmatch(line.rstrip("\r\n"))
+            if match is None:
+                raise ValueError(f"{path}:{number}: unsupported TOML without a TOML parser "
+                                 f"(use Python 3.11+ or pip install tomli)")
+            if match.group("table"):
+                table = {}
+                document.setdefault(match.group("table"), []).append(table)
+            elif match.group("key"):
+                key, value = match.group("key", "value")
+                if key in table:
+                    raise ValueError(f"{path}:{number}: duplicate key '{key}'")
+                if value[0] == '"':
+                    table[key] = json.loads(value)
+                elif value in ("true", "false"):
+                    table[key] = value == "true"
+                else:
+                    table[key] = int(value)
+    return document
+
+
+def read_rules_file(path):
+    """
+    Rules of a .toml file ([[rule]] tables) or a .yaml/.yml file (a 'rule'
+    list of mappings, read with PyYAML when it is installed). TOML is read
+    with tomllib, or tomli before Python 3.11; without either, only the
+    subset of read_toml_subset is accepted.
+    """
+    path = Path(path)
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"{path}: reading YAML rules needs PyYAML (pip install pyyaml)") from None
+        with open(path, encoding="utf-8") as f:
+            document = yaml.safe_load(f) or {}
+    else:
+        toml = toml_parser()
+        if toml is None:
+            document = read_toml_subset(path)
+        else:
+            with open(path, "rb") as f:
+                try:
+                    document = toml.load(f)
+                except toml.TOMLDecodeError as error:
+                    raise ValueError(f"{path}: {error}") from None
+
+    tables = document.get("rule", []) if isinstance(document, dict) else None
+    if not isinstance(tables, list) or not all(isinstance(fields, dict) for fields in tables):
+        raise ValueError(f"{path}: rules must be a list of 'rule' tables")
+    return [Rule.from_dict(fields, str(path)) for fields in tables]
+
+
+def default_rules():
+    # The built-in classifications, read once per process
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = read_rules_file(DEFAULT_RULES_FILE)
+    return _default_rules
+
+
+def builtin_rules(*names):
+    rules = {rule.name: rule for rule in default_rules()}
+    return [rules[name] for name in names]
+
+
+def load_rules(paths=()):
+    """
+    The built-in rules with the rules of `paths` applied in order: a rule
+    with a new name is added, one with a known name replaces it, and
+    'enabled = false' turns it off.
+    """
+    rules = {rule.name: rule for rule in default_rules()}
+    for path in paths:
+        for rule in read_rules_file(path):
+            rules.pop(rule.name, None)  # A replaced rule moves to the end
+            rules[rule.name] = rule
+    return [rule for rule in rules.values() if rule.enabled]
+
+
+def rules_fingerprint(rules):
+    # Part of the result cache key, so a different rule set never reuses rows
+    text = json.dumps([rule.as_dict() for rule in rules], sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+#end of loading
+
+
+def evaluate_rules(table, file_name, rules):
+    """
+    Rows of every rule for one file, in rule order. The rules are grouped
+    by source, so each column of the table is walked once whatever the
+    number of rules, and every candidate is tested against its whole group.
+    """
+    inputs = table.input_set
+    ports = table.port_set
+    drivers = (table.blocking_drivers(), table.nblocking_drivers())
+    assigned = None
+    widths = {}
+    rows = [[] for rule in rules]
+
+    groups = {}
+    for position, rule in enumerate(rules):
+        if rule.widths not in widths:
+            widths[rule.widths] = WIDTHS[rule.widths](table)
+        groups.setdefault(rule.source, []).append((rule, widths[rule.widths], rows[position]))
+    if any(rule.assigned for rule in rules):
+        assigned = table.nblocking_drivers(keep_constants=True).keys() | drivers[0].keys()
+
+    for source, group in groups.items():
+        for item in SOURCES[source](table):
+            for rule, width_data, rule_rows in group:
+                if rule.trace_drivers and item not in inputs:
+                    for by_lhs in drivers:
+                        if item in by_lhs:
+                            rhs = by_lhs[item][0]  # First assignment
+                            if rhs in inputs:
+                                width = width_data.get(rhs, 0)
+                                if rule.width_ok(width):
+                                    rule_rows.append(rule_row(rule, rhs, width, file_name))
+                    continue
+                if rule.assigned and item not in assigned:
+                    continue
+                width = width_data.get(item, 0)
+                if not rule.width_ok(width):
+                    continue
+                if rule.require_port and item not in ports and (
+                        rule.require_port_max_width is None or width <= rule.require_port_max_width):
+                    continue
+                rule_rows.append(rule_row(rule, item, width, file_name))
+
+    return [row for rule_rows in rows for row in rule_rows]
+
+
+def rule_row(rule, name, width, file_name):
+    width = rule.width_label if rule.width_label is not None else width
+    return [name, width, rule.signal_type, rule.appeared_in, file_name, rule.cia]
@@ -0,0 +1,185 @@
+# -----------------------------------------------------------------------------
+# File Name: signal_table.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Extracts every fact the detectors need (ports, if/case operands,
+#              assignments, widths, parameters) from the module AST and token
+#              stream of an individual Verilog/SystemVerilog file and keeps
+#              them in a per-file signal table
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from rules.engine import StatementFacts, walk
+from rules.module_ast import build_ast
+from rules.profiling import span
+
+
+# Synchronous resets and stray operators; posedge/negedge terms of the process are left out by StatementFacts
+IF_ELSE_SKIP = ["&&", "rst", "reset", "rst_ni", "||", "==", "=", "!=", ">=", "<=", "<", ">"]
+
+
+class SignalTable:
+    """
+    Facts about one file, filled by build_signal_table().
+
+    inputs         -- sorted input names of every module
+    outputs        -- sorted output names of every module
+    ports          -- names in the module port lists, in header order
+    if_else        -- operands of if (...) conditions, in file order
+    cases          -- operands of case/casez/casex, in file order
+    blocking       -- [lhs, rhs, constant] for every '=' and 'assign' assignment
+    nblocking      -- [lhs, rhs, constant] for every '<=' assignment
+    widths         -- name -> width from ranges that need no parameter ([7:0], [2*4-1:0])
+    param_widths   -- name -> width with the parameters of the module evaluated
+                      ([W-1:0], [$clog2(DEPTH)-1:0], see rules.const_expr)
+    params         -- [name, value - 1] for every parameter with a constant value
+    param_bits     -- names of 'parameter bit' declarations
+    parameters     -- names of every other parameter/localparam
+
+    input_set, output_set and port_set hold the same names
+    as the lists above for O(1) membership tests in the detectors.
+    """
+
+    def __init__(self):
+        self.inputs = []
+        self.outputs = []
+        self.ports = []
+        self.if_else = []
+        self.cases = []
+        self.blocking = []
+        self.nblocking = []
+        self.widths = {}
+        self.param_widths = {}
+        self.params = []
+        self.param_bits = []
+        self.parameters = []
+        self.input_set = frozenset()
+        self.output_set = frozenset()
+        self.port_set = frozenset()
+        self._drivers = {}
+
+    def blocking_assign(self, keep_constants=False):
+        lhs_ba = []
+        rhs_ba = []
+        for lhs, rhs, constant in self.blocking:
+            if keep_constants or not constant:
+                lhs_ba.append(lhs)
+                rhs_ba.append(rhs)
+        return lhs_ba, rhs_ba
+
+    def nblocking_assign(self, keep_constants=False):
+        lhs_nba = []
+        rhs_nba = []
+        for lhs, rhs, constant in self.nblocking:
+            if keep_constants or not constant:
+                lhs_nba.append(lhs)
+                rhs_nba.append(rhs)
+        return lhs_nba, rhs_nba
+
+    def blocking_drivers(self, keep_constants=False):
+        """
+        lhs -> [rhs, ...] of the '=' assignments, in file order. Indexed once
+        and reused, so a detector looks up the drivers of a signal instead of
+        searching the lhs list with index().
+        """
+        key = ("blocking", keep_constants)
+        if key not in self._drivers:
+            self._drivers[key] = index_drivers(*self.blocking_assign(keep_constants))
+        return self._drivers[key]
+
+    def nblocking_drivers(self, keep_constants=False):
+        # Same as blocking_drivers() for the '<=' assignments
+        key = ("nblocking", keep_constants)
+        if key not in self._drivers:
+            self._drivers[key] = index_drivers(*self.nblocking_assign(keep_constants))
+        return self._drivers[key]
+
+
+def index_drivers(lhs_list, rhs_list):
+    drivers = {}
+    for lhs, rhs in zip(lhs_list, rhs_list):
+        drivers.setdefault(lhs, []).append(rhs)
+    return drivers
+
+
+def declaration_facts(table, ast):
+    """
+    Ports, widths and parameters of every module of the file, and the
+    parameters of its packages. When a name is declared more than once the
+    first declaration wins, so 'output reg [7:0] q' is taken from the port
+    declaration.
+    """
+    inputs = set()
+    outputs = set()
+    for module in ast.modules:
+        table.ports.extend(module.port_order)
+        for name, port in module.ports.items():
+            if port.direction == "input":
+                inputs.add(name)
+            elif port.direction == "output":
+                outputs.add(name)
+        for declaration in module.declarations:
+            if declaration.width is None:
+                continue
+            table.param_widths.setdefault(declaration.name, declaration.width)
+            if declaration.literal:
+                table.widths.setdefault(declaration.name, declaration.width)
+        parameter_facts(table, module)
+    for package in ast.packages:
+        parameter_facts(table, package)
+
+    table.inputs = sorted(inputs)
+    table.outputs = sorted(outputs)
+
+
+def parameter_facts(table, scope):
+    # Parameters of a module or package
+    for param in scope.parameters:
+        if param.is_bit:
+            table.param_bits.append(param.name)
+        else:
+            table.parameters.append(param.name)
+        value = scope.param_values.get(param.name)
+        if value is not None:
+            table.params.append([param.name, str(value - 1)])
+
+
+def build_signal_table(ctx):
+    table = SignalTable()
+    file = ctx.file_name
+
+    # Module AST and statement facts, from one walk over the token stream
+    facts = StatementFacts()
+    with span("walk_tokens", "extract", file=file) as event:
+        if ctx.ast is None:
+            ctx.ast = build_ast(ctx.iter_tokens(), (facts,), ctx.packages)
+            count = ctx.ast.token_count
+        else:
+            count = walk(ctx.iter_tokens(), (facts,))
+        table.if_else, table.cases, table.blocking, table.nblocking = facts.result()
+        event["matches"] = len(ctx.ast.modules) + len(table.if_else) + len(table.cases) \
+            + len(table.blocking) + len(table.nblocking)
+        event["tokens"] = count
+
+    # Declarations, from the module AST
+    with span("declarations", "extract", file=file) as event:
+        declaration_facts(table, ctx.ast)
+        event["matches"] = len(table.inputs) + len(table.outputs) + len(table.param_widths)
+    table.input_set = frozenset(table.inputs)
+    table.output_set = frozenset(table.outputs)
+    table.port_set = frozenset(table.ports)
+
+    table.if_else = [item for item in table.if_else if item not in IF_ELSE_SKIP]
+
+    return table
+
+
+def get_signal_table(ctx):
+    # Built once per file and shared by every detector
+    if ctx.signal_table is None:
+        ctx.signal_table = build_signal_table(ctx)
+    return ctx.signal_table
@@ -0,0 +1,129 @@
+# -----------------------------------------------------------------------------
+# File Name: type_index.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Index of typedefs (aliases, enums, packed/unpacked structs and
+#              unions) by name, for the whole tree or one scope, that gives the
+#              total bit width of a type name
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from rules import lexer
+from rules.const_expr import evaluate
+
+
+class TypeIndex:
+    """
+    Type name -> layout, filled with add() from typedef records
+
+        [name, kind, [[base, count], ...]]
+
+    kind is alias, enum, struct or union, with one [base, count] per field
+    (a single one for alias and enum). base is the width of a built-in
+    type, a type name, a nested [kind, fields] layout, or None when
+    unknown. count is the number of elements of the field (product of its
+    packed and unpacked dimensions), or, when they use a name from another
+    file, the dimensions as [[msb, lsb or None], ...] expression text that
+    `values` evaluates in the record's package: values(package, name).
+
+    A name that is not in the index is looked up as pkg::name for each of
+    the `imports` ([package, name or '*'] pairs) that covers it, then in
+    `outer`, so a module's own typedefs shadow the imported ones and those
+    of its file and of the tree. Widths are computed on first use and
+    kept, so later lookups are dict hits.
+    """
+
+    def __init__(self, records=(), outer=None, imports=(), values=None):
+        self.types = {}
+        self.outer = outer
+        self.imports = imports
+        self.values = values
+        self._widths = {}
+        self._pending = set()
+        self.add(records)
+
+    def add(self, records, scope=None):
+        # Records of a package are known as scope::name and, for files that use them without an import, by name
+        for name, kind, fields in records:
+            if scope is not None:
+                self.types.setdefault(scope + "::" + name, (kind, fields, scope))
+            self.types.setdefault(name, (kind, fields, scope))  # The first definition wins
+        self._widths.clear()
+
+    def __contains__(self, name):
+        return name in self.types or (self.outer is not None and name in self.outer)
+
+    def __len__(self):
+        return len(self.types)
+
+    def width(self, name):
+        # Total bits of the type `name` (lowercase), None when it is unknown or unresolved
+        if name in self._widths:
+            return self._widths[name]
+        layout = self.types.get(name)
+        if layout is None:
+            if self.outer is None:
+                return None
+            for package, item in self.imports:
+                if (item == "*" or item == name) and package + "::" + name in self.outer:
+                    return self.outer.width(package + "::" + name)
+            return self.outer.width(name)
+        if name in self._pending:
+            return None  # A type defined through itself
+        self._pending.add(name)
+        kind, fields, scope = layout
+        width = layout_width(kind, fields, self.scoped_width(scope), self.scoped_count(scope))
+        self._pending.discard(name)
+        self._widths[name] = width
+        return width
+
+    def scoped_width(self, scope):
+        # Type names inside a package record mean that package's types first
+        if scope is None:
+            return self.width
+        return lambda name: self.width(scope + "::" + name if scope + "::" + name in self.types else name)
+
+    def scoped_count(self, scope):
+        def count(dims):
+            if self.values is None:
+                return None
+            lookup = lambda name: self.values(scope, name)
+            total = 1
+            for msb_text, lsb_text in dims:
+                msb = evaluate(lexer.tokenize(msb_text), lookup)
+                lsb = evaluate(lexer.tokenize(lsb_text), lookup) if lsb_text is not None else None
+                if msb is None or (lsb_text is not None and lsb is None):
+                    return None
+                total *= msb if lsb_text is None else abs(msb - lsb) + 1
+            return total
+        return count
+
+
+def layout_width(kind, fields, type_width, dims_count):
+    """
+    Bits of a layout: the sum of its fields (a union takes the widest), each
+    the width of its base times its count. `type_width` resolves names and
+    `dims_count` dimensions kept as text.
+    """
+    widths = []
+    for base, count in fields:
+        if isinstance(count, list):
+            count = dims_count(count)
+        if count is None:
+            return None
+        if isinstance(base, str):
+            width = type_width(base)
+        elif isinstance(base, list):
+            width = layout_width(base[0], base[1], type_width, dims_count)
+        else:
+            width = base
+        if width is None:
+            return None
+        widths.append(width * count)
+    if not widths:
+        return None
+    return max(widths) if kind == "union" else sum(widths)
@@ -0,0 +1,11 @@
+# -----------------------------------------------------------------------------
+# File Name: __init__.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Regression tests of the lexer, preprocessor, parser and
+#              detectors; run with 'python -m pytest' from the repository root
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
@@ -0,0 +1,72 @@
+# -----------------------------------------------------------------------------
+# File Name: test_const_expr.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Constant expressions: operator precedence, $clog2, and module
+#              parameters that refer to each other, in any order or in a cycle
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import pytest
+
+from rules import lexer
+from rules.const_expr import evaluate
+from rules.module_ast import build_ast
+
+
+def value(text, names=None):
+    # Names are looked up lowercased, as module_ast declares them
+    names = names or {}
+    return evaluate(lexer.tokenize(text), names.get)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2 + 3 * 4", 14),
+    ("(2 + 3) * 4", 20),
+    ("10 - 4 - 3", 3),
+    ("8 / 2 / 2", 2),
+    ("2 ** 3 ** 2", 64),  # Left-associative, as every binary operator
+    ("1 << 2 + 1", 8),
+    ("7 & 3 | 8", 11),
+    ("1 || 0 && 0", 1),
+    ("-2 + 5", 3),
+    ("~0 & 4'hf", 15),
+    ("16'hff_ff", 65535),
+    ("3 > 2 ? 8'd15 : 4", 15),
+    ("1 ? 2 : 0 ? 3 : 4", 2),
+])
+def test_precedence(text, expected):
+    assert value(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$clog2(256)", 8),
+    ("$clog2(257)", 9),
+    ("$clog2(1)", 0),
+    ("$clog2(0)", 0),
+    ("$clog2(DEPTH) - 1", 3),
+])
+def test_clog2(text, expected):
+    assert value(text, {"depth": 16}) == expected
+
+
+def test_unknown_names_are_unresolved():
+    assert value("W - 1") is None
+    assert value("W - 1", {"w": 8}) == 7
+
+
+def test_parameters_in_any_order_and_cycles():
+    code = ("module m #(parameter A = B + 1, parameter B = 2 * C, parameter C = 4,\n"
+            "           parameter P = Q, parameter Q = P, parameter D = $clog2(A))\n"
+            "  (input [A-1:0] a, input [P-1:0] p);\n"
+            "  localparam W = D + 1;\n"
+            "  wire [W:0] w;\n"
+            "endmodule\n")
+    module, = build_ast(lexer.tokenize(code)).modules
+    assert module.param_values == {"a": 9, "b": 8, "c": 4, "d": 4, "w": 5}  # P and Q form a cycle
+    assert {declaration.name: declaration.width for declaration in module.declarations} == \
+        {"a": 9, "p": None, "w": 6}
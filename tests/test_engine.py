@@ -0,0 +1,137 @@
+# -----------------------------------------------------------------------------
+# File Name: test_engine.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Statement splitting of the token walk: block keywords, block
+#              labels and attribute instances around modules and declarations,
+#              and the same AST from a token stream read a few tokens at a time
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from main import detect_file
+from rules import engine, lexer, preprocessor
+from rules.module_ast import build_ast
+from rules.preprocessor import Preprocessor
+
+
+def modules_of(code):
+    # module name -> declared names, in file order
+    ast = build_ast(lexer.tokenize(code))
+    return {module.name: [declaration.name for declaration in module.declarations] for module in ast.modules}
+
+
+def test_module_after_interface(tmp_path):
+    rtl = tmp_path / "iface.sv"
+    rtl.write_text(
+        "interface bus_if;\n"
+        "  logic [7:0] data;\n"
+        "endinterface\n"
+        "module top(input clk, input [127:0] aes_key, output reg [7:0] status);\n"
+        "  always @(posedge clk) if (aes_key == 0) status <= 1;\n"
+        "endmodule\n")
+    assert list(modules_of(rtl.read_text())) == ["top"]
+    assets = {row[0] for row in detect_file(str(rtl), "iface.sv")}
+    assert {"aes_key", "status"} <= assets
+
+
+def test_module_after_other_end_keywords():
+    code = ""
+    for kind in ("class", "program", "checker"):
+        code += f"{kind} c_{kind};\nend{kind}\nmodule m_{kind}(input a);\nendmodule\n"
+    code += "primitive p(output y, input a);\ntable 0 : 1; endtable\nendprimitive\nmodule m_udp(input a);\nendmodule\n"
+    assert list(modules_of(code)) == ["m_class", "m_program", "m_checker", "m_udp"]
+
+
+def test_module_after_labeled_endmodule():
+    code = ("module first(input [127:0] key_a);\n"
+            "endmodule : first\n"
+            "module second(input [127:0] key_b);\n"
+            "endmodule : second\n")
+    assert modules_of(code) == {"first": ["key_a"], "second": ["key_b"]}
+
+
+def test_declaration_after_labeled_end():
+    code = ("module m(input clk);\n"
+            "  reg [3:0] cnt;\n"
+            "  always @(*) begin : blk\n"
+            "    cnt = 0;\n"
+            "  end : blk\n"
+            "  wire [127:0] secret_key;\n"
+            "endmodule\n")
+    assert modules_of(code) == {"m": ["clk", "cnt", "secret_key"]}
+
+
+def test_block_keyword_inside_brackets(tmp_path):
+    rtl = tmp_path / "regs.v"
+    rtl.write_text(
+        "module regs(clk, key, wdata, q);\n"
+        "  typedef struct packed { logic [7:0] a; logic [7:0] b; } pair_t;\n"
+        "  localparam pair_t RST = '{default: 8'h0};\n"
+        "  input clk;\n"
+        "  input [127:0] key;\n"
+        "  input [31:0] wdata;\n"
+        "  output [31:0] q;\n"
+        "  assign q = wdata;\n"
+        "endmodule\n")
+    assert modules_of(rtl.read_text()) == {"regs": ["clk", "key", "wdata", "q"]}
+    assets = {row[0] for row in detect_file(str(rtl), "regs.v") if row[2] == "data"}
+    assert assets == {"key", "wdata", "q"}
+
+
+def test_stray_close_bracket_keeps_statements_apart():
+    code = "module m(input a);\n  wire x = a);\n  wire [3:0] y;\n  wire [7:0] z;\nendmodule\n"
+    assert modules_of(code) == {"m": ["a", "x", "y", "z"]}
+
+
+def test_attributes_are_skipped():
+    code = ("(* keep *) module m(input (* mark = \"yes\" *) [7:0] a);\n"
+            "  (* full_case *) always @(*) begin\n"
+            "  end\n"
+            "  (* keep *) wire [3:0] w;\n"
+            "endmodule\n")
+    assert modules_of(code) == {"m": ["a", "w"]}
+
+
+def test_star_event_control_is_not_an_attribute():
+    texts = [token.text for token in lexer.tokenize("always @(*) a = b; always @( * ) c = d;")]
+    assert texts[:5] == ["always", "@", "(", "*", ")"]
+    assert texts[10:14] == ["@", "(", "*", ")"]
+
+
+STREAMED = """
+`define PORT(name, w) input [w-1:0] name
+module core import cfg_pkg::*; (
+  `PORT(key, 128),
+  input clk);
+`ifdef WIDE
+  wire [255:0] wide;
+`else
+  wire [63:0] narrow;
+`endif
+  reg [7:0] st;
+  always @(posedge clk) begin : seq
+    if (key == 0) st <= 1;
+  end : seq
+endmodule : core
+"""
+
+
+def test_stream_read_in_small_windows(monkeypatch):
+    def blocks(ast):
+        return [(block.kind, block.sensitivity) for module in ast.modules for block in module.blocks]
+
+    expected = build_ast(Preprocessor().preprocess("core.sv", lexer.tokenize(STREAMED)))
+    monkeypatch.setattr(engine, "WINDOW", 3)
+    monkeypatch.setattr(preprocessor, "CHUNK", 2)
+    streamed = build_ast(Preprocessor().preprocess("core.sv", lexer.iter_tokens(STREAMED)))
+
+    for ast in (expected, streamed):
+        module, = ast.modules
+        assert module.imports == [("cfg_pkg", "*")]
+        assert [declaration.name for declaration in module.declarations] == ["key", "clk", "narrow", "st"]
+        assert blocks(ast) == [("always", "( posedge clk )")]
+    assert streamed.token_count == expected.token_count
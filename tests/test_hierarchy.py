@@ -0,0 +1,43 @@
+# -----------------------------------------------------------------------------
+# File Name: test_hierarchy.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Classifications propagated through port bindings, kept apart
+#              for files of the same name in different directories
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from main import scan
+
+
+def propagated(rows):
+    return sorted((row["Filename"], row["Asset"], row["Signal_type"])
+                  for row in rows if row["Appeared in"].startswith("port binding"))
+
+
+def test_same_file_name_in_two_directories(tmp_path):
+    for block in ("a", "b"):
+        (tmp_path / block).mkdir()
+    # a/top.v drives a secret into sink; b/top.v has its own 'secret', a plain wire
+    (tmp_path / "a" / "top.v").write_text(
+        "module top_a(input [127:0] secret);\n  sink u_sink(.din(secret));\nendmodule\n")
+    (tmp_path / "a" / "sink.v").write_text("module sink(input din);\nendmodule\n")
+    (tmp_path / "b" / "top.v").write_text(
+        "module top_b(input clk);\n  wire secret;\n  probe u_probe(.din(secret));\nendmodule\n")
+    (tmp_path / "b" / "probe.v").write_text("module probe(input din);\nendmodule\n")
+
+    assert propagated(scan(str(tmp_path), hierarchy=True)) == [("sink.v", "din", "data")]
+
+
+def test_same_signal_in_two_modules_of_a_file(tmp_path):
+    (tmp_path / "top.v").write_text(
+        "module top(input [127:0] key);\n  leaf u_leaf(.din(key));\nendmodule\n"
+        "module other(input clk);\n  wire key;\n  probe u_probe(.din(key));\nendmodule\n"
+        "module leaf(input din);\nendmodule\n"
+        "module probe(input din);\nendmodule\n")
+
+    assert propagated(scan(str(tmp_path), hierarchy=True)) == [("top.v", "din", "data")]
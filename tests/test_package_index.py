@@ -0,0 +1,58 @@
+# -----------------------------------------------------------------------------
+# File Name: test_package_index.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Package values and types resolved across files, and the
+#              cached rows a package edit invalidates
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from main import scan
+from rules.result_cache import ResultCache
+
+
+PACKAGE = """
+package cfg_pkg;
+  localparam int KEY_BYTES = {key_bytes};
+  typedef logic [KEY_BYTES*8-1:0] key_t;
+endpackage
+"""
+CORE = """
+module core import cfg_pkg::*; (input key_t aes_key, input [cfg_pkg::KEY_BYTES-1:0] key_mask);
+endmodule
+"""
+PLAIN = """
+module plain(input [127:0] secret_key);
+endmodule
+"""
+
+
+def widths(rows, file_name):
+    return {row["Asset"]: row["width"] for row in rows if row["Filename"] == file_name}
+
+
+def test_package_edit_only_reanalyzes_its_users(tmp_path):
+    rtl = tmp_path / "rtl"
+    rtl.mkdir()
+    (rtl / "cfg_pkg.sv").write_text(PACKAGE.format(key_bytes=16))
+    (rtl / "core.sv").write_text(CORE)
+    (rtl / "plain.v").write_text(PLAIN)
+
+    cache = ResultCache(tmp_path / "cache")
+    try:
+        rows = scan(str(rtl), cache=cache)
+        assert widths(rows, "core.sv") == {"aes_key": 128, "key_mask": 16}
+        assert cache.misses == 3
+
+        (rtl / "cfg_pkg.sv").write_text(PACKAGE.format(key_bytes=32))
+        cache.hits = cache.misses = 0
+        rows = scan(str(rtl), cache=cache)
+        assert widths(rows, "core.sv") == {"aes_key": 256, "key_mask": 32}
+        assert widths(rows, "plain.v") == {"secret_key": 128}
+        assert (cache.hits, cache.misses) == (1, 2)  # plain.v is served from the cache
+    finally:
+        cache.close()
@@ -0,0 +1,109 @@
+# -----------------------------------------------------------------------------
+# File Name: test_preprocessor.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: `define macros with arguments, defaults and `` pasting, nested
+#              `ifdef/`elsif/`else and `include search paths, as expanded by
+#              the preprocessor
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from rules import lexer
+from rules.preprocessor import Preprocessor
+
+
+def expand(code, path="test.v", preprocessor=None):
+    # Expanded token texts of `code`, read as the file `path`
+    preprocessor = preprocessor if preprocessor is not None else Preprocessor()
+    return " ".join(token.text for token in preprocessor.preprocess(str(path), lexer.tokenize(code)))
+
+
+def test_object_macro():
+    assert expand("`define W 8\nwire [`W-1:0] a;") == "wire [ 8 - 1 : 0 ] a ;"
+
+
+def test_macro_arguments():
+    code = "`define RANGE(msb, lsb) [msb:lsb]\nwire `RANGE(7, 0) a;"
+    assert expand(code) == "wire [ 7 : 0 ] a ;"
+
+
+def test_macro_argument_defaults():
+    code = "`define BUS(name, w = 8) [w-1:0] name\nwire `BUS(a); wire `BUS(b, 16);"
+    assert expand(code) == "wire [ 8 - 1 : 0 ] a ; wire [ 16 - 1 : 0 ] b ;"
+
+
+def test_paste_with_parameter_on_either_side():
+    code = ("`define CAT(a, b) a``b\n"
+            "`define KEY(x) key_``x\n"
+            "`define Q(n) n``_q\n"
+            "wire `CAT(da, ta); wire `KEY(lo); wire `Q(data);")
+    assert expand(code) == "wire data ; wire key_lo ; wire data_q ;"
+
+
+def test_macro_in_macro_body():
+    code = "`define W 4\n`define TWICE (2*`W)\nwire [`TWICE-1:0] a;"
+    assert expand(code) == "wire [ ( 2 * 4 ) - 1 : 0 ] a ;"
+
+
+def test_undef():
+    code = "`define W 4\n`undef W\n`ifdef W\nwire a;\n`else\nwire b;\n`endif"
+    assert expand(code) == "wire b ;"
+
+
+def test_command_line_define():
+    assert expand("wire [`W-1:0] a;", preprocessor=Preprocessor(defines={"W": "16"})) == "wire [ 16 - 1 : 0 ] a ;"
+
+
+NESTED = """
+`ifdef A
+  `ifdef B
+    wire ab;
+  `elsif C
+    wire ac;
+  `else
+    wire a;
+  `endif
+`elsif C
+  wire c;
+`else
+  `ifndef B
+    wire none;
+  `endif
+`endif
+"""
+
+
+def test_nested_conditionals():
+    for defines, expected in [({"A": "", "B": ""}, "wire ab ;"), ({"A": "", "C": ""}, "wire ac ;"),
+                              ({"A": ""}, "wire a ;"), ({"C": ""}, "wire c ;"),
+                              ({"B": "", "C": ""}, "wire c ;"), ({}, "wire none ;"), ({"B": ""}, "")]:
+        assert expand(NESTED, preprocessor=Preprocessor(defines=defines)) == expected, defines
+
+
+def test_include_search_path(tmp_path):
+    for directory in ("rtl", "inc", "local"):
+        (tmp_path / directory).mkdir()
+    (tmp_path / "inc" / "defs.vh").write_text("`define W 16\n")
+    (tmp_path / "inc" / "other.vh").write_text("`define V 2\n")
+    top = tmp_path / "rtl" / "top.v"
+    code = '`include "defs.vh"\n`include <other.vh>\nwire [`W-1:0] a; wire [`V:0] b;'
+
+    assert expand(code, top) == "wire [ `W - 1 : 0 ] a ; wire [ `V : 0 ] b ;"  # Not found: left as they are
+    with_dirs = Preprocessor(include_dirs=[str(tmp_path / "inc")])
+    assert expand(code, top, with_dirs) == "wire [ 16 - 1 : 0 ] a ; wire [ 2 : 0 ] b ;"
+
+    # A header next to the including file comes before the include dirs
+    (tmp_path / "rtl" / "defs.vh").write_text("`define W 32\n")
+    assert expand(code, top, Preprocessor(include_dirs=[str(tmp_path / "inc")])) == \
+        "wire [ 32 - 1 : 0 ] a ; wire [ 2 : 0 ] b ;"
+
+
+def test_include_in_inactive_branch(tmp_path):
+    (tmp_path / "defs.vh").write_text("`define W 8\n")
+    code = '`ifdef USE_DEFS\n`include "defs.vh"\n`endif\nwire [`W-1:0] a;'
+    assert expand(code, tmp_path / "top.v") == "wire [ `W - 1 : 0 ] a ;"
+    assert expand(code, tmp_path / "top.v", Preprocessor(defines={"USE_DEFS": ""})) == "wire [ 8 - 1 : 0 ] a ;"
@@ -0,0 +1,35 @@
+# -----------------------------------------------------------------------------
+# File Name: test_rule_registry.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Rules files read with and without a TOML parser
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import pytest
+
+from rules import rule_registry
+from rules.rule_registry import DEFAULT_RULES_FILE, read_rules_file, read_toml_subset
+
+
+def test_default_rules_read_without_a_toml_parser(monkeypatch):
+    with_parser = [rule.as_dict() for rule in read_rules_file(DEFAULT_RULES_FILE)]
+    monkeypatch.setattr(rule_registry, "toml_parser", lambda: None)
+    assert [rule.as_dict() for rule in read_rules_file(DEFAULT_RULES_FILE)] == with_parser
+
+
+def test_toml_subset_values(tmp_path):
+    rules_file = tmp_path / "rules.toml"
+    rules_file.write_text('# comment\n[[rule]]\nname = "a \\"b\\""  # trailing\nmin_width = 1_0\nassigned = false\n')
+    assert read_toml_subset(rules_file) == {"rule": [{"name": 'a "b"', "min_width": 10, "assigned": False}]}
+
+
+def test_toml_subset_refuses_other_toml(tmp_path):
+    rules_file = tmp_path / "rules.toml"
+    rules_file.write_text('[[rule]]\nname = "a"\ncia = ["C"]\n')
+    with pytest.raises(ValueError, match="rules.toml:3"):
+        read_toml_subset(rules_file)
@@ -0,0 +1,55 @@
+# -----------------------------------------------------------------------------
+# File Name: test_signal_table.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Facts of the per-file signal table and the rows the built-in
+#              rules give from them
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+from main import detect_file
+from rules.parse_context import ParseContext
+from rules.signal_table import get_signal_table
+
+
+RESET_RTL = """
+module apb_ctrl(input pclk, input presetn, input psel, input penable, output reg busy);
+  always @(posedge pclk or negedge presetn) begin
+    if (!presetn)
+      busy <= 1'b0;
+    else if (psel && penable)
+      busy <= 1'b1;
+  end
+endmodule
+"""
+
+SYNC_CLEAR_RTL = """
+module sync_ctrl(input clk, input clear, input start, output reg busy);
+  always @(posedge clk)
+    if (clear)
+      busy <= 1'b0;
+    else if (start)
+      busy <= 1'b1;
+endmodule
+"""
+
+
+def test_active_low_reset_is_not_an_asset(tmp_path):
+    rtl = tmp_path / "apb_ctrl.v"
+    rtl.write_text(RESET_RTL)
+    table = get_signal_table(ParseContext(str(rtl), "apb_ctrl.v"))
+    assert table.if_else == ["psel", "penable"]
+    rows = detect_file(str(rtl), "apb_ctrl.v")
+    assert sorted(row[0] for row in rows if row[2] == "Control") == ["penable", "psel"]
+
+
+def test_only_edge_terms_of_the_process_are_left_out(tmp_path):
+    # A synchronous clear is not in the sensitivity, so it stays an if operand
+    rtl = tmp_path / "sync_ctrl.v"
+    rtl.write_text(SYNC_CLEAR_RTL)
+    table = get_signal_table(ParseContext(str(rtl), "sync_ctrl.v"))
+    assert table.if_else == ["clear", "start"]
@@ -0,0 +1,52 @@
+# -----------------------------------------------------------------------------
+# File Name: test_watch.py
+# Version: 0.1
+# Author: Subroto Kumer Deb Nath
+# Email: subroto.ece.ku@gmail.com
+# Description: Re-analysis of changed files by the watch command, including
+#              files that cannot be read when they change
+# Copyright (c) 2025 Subroto Kumer Deb Nath
+# This file is part of an open-source project and is released under the MIT License.
+# You are free to use, modify, and distribute this file with proper attribution.
+# -----------------------------------------------------------------------------
+
+
+import io
+
+import main
+
+
+def test_unreadable_file_is_retried_at_the_next_poll(tmp_path, monkeypatch):
+    rtl = tmp_path / "regs.v"
+    rtl.write_text("module regs(input clk, output reg done);\nendmodule\n")
+    (tmp_path / "other.v").write_text("module other(input [127:0] key);\nendmodule\n")
+
+    detect_file = main.detect_file
+    failures = []
+
+    def flaky_detect_file(file_path, *args):
+        if failures and file_path.endswith("regs.v"):
+            raise failures.pop()
+        return detect_file(file_path, *args)
+
+    def poll(seconds):
+        polls.append(seconds)
+        if len(polls) == 1:
+            # Rewritten, but still unreadable when the watcher gets to it
+            rtl.write_text("module regs(input clk, input [127:0] wdata, output reg done);\nendmodule\n")
+            failures.append(PermissionError("busy"))
+        elif len(polls) == 3:
+            raise KeyboardInterrupt
+
+    polls = []
+    out = io.StringIO()
+    monkeypatch.setattr(main, "detect_file", flaky_detect_file)
+    monkeypatch.setattr(main.time, "sleep", poll)
+    assert main.watch(str(tmp_path), diff=True, out=out) == 0
+
+    lines = out.getvalue().splitlines()
+    failed = next(k for k, line in enumerate(lines) if "cannot analyze" in line)
+    added = next(k for k, line in enumerate(lines) if line.startswith("+ ") and ",wdata," in line)
+    assert failed < added
+    assert not failures
+